@@ -161,14 +161,19 @@ class MDSampler:
         total_iterations = num_samples * thinning + burn_in
         logger.info(f"Starting multi-dimensional continuous sampling: total_iterations={total_iterations}, init={init}")
 
+        # Draw every proposal step and acceptance uniform up front; one multivariate_normal
+        # call factorizes the covariance once instead of once per iteration
+        noise = np.random.multivariate_normal(np.zeros(d), cov, size=total_iterations)
+        uniforms = np.random.rand(total_iterations)
+
         for i in range(total_iterations):
             # 从多维正态分布中生成候选点
-            x_candidate = x_current + np.random.multivariate_normal(np.zeros(d), cov)
+            x_candidate = x_current + noise[i]
             # 计算接受率
             p_current = self.target(x_current)
             p_candidate = self.target(x_candidate)
             acceptance_ratio = 1.0 if p_current == 0 else p_candidate / p_current
-            if np.random.rand() < min(1, acceptance_ratio):
+            if uniforms[i] < min(1, acceptance_ratio):
                 x_current = x_candidate
             if i >= burn_in and ((i - burn_in) % thinning == 0):
                 samples.append(x_current.copy())
@@ -9,10 +9,17 @@
 import os
 import sqlite3
 import logging
+import time
 import queue
+import itertools
 import threading
-from typing import Any, Optional, List, Dict, Union, Iterator
-from contextlib import contextmanager
+from typing import Any, Optional, List, Dict, Union
+
+# Optional thinner SQLite binding
+try:
+    import apsw
+except ImportError:
+    apsw = None
 
 # SQLite General Error
 class SQLiteError(Exception):
@@ -50,54 +57,403 @@ def setup_logger(name: str = 'sqlite_client', level: int = logging.INFO) -> logg
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    # Loggers are cached by name, only attach the handler once
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    logger.propagate = False
     return logger
 
 # Global logger initialization
 logger = setup_logger()
 
+# Default pool size, enough connections for concurrent callers on most machines
+DEFAULT_POOL_SIZE = max(4, os.cpu_count() or 1)
+
+# Default (empty) query parameters, passed straight to cursor.execute
+_EMPTY: tuple = ()
+
+# Conservative host parameter limit (SQLITE_MAX_VARIABLE_NUMBER before 3.32)
+_MAX_VARIABLES = 999
+
+# Row factory building plain dicts directly
+def _make_dict_factory():
+    """
+    Create a row factory returning rows as dictionaries (for reading cursors)
+    Column names are cached per cursor description, so only the first
+    row of each result set pays for extracting them
+    """
+    cache = [None, ()]
+    
+    def _dict_factory(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
+        description = cursor.description
+        if description is not cache[0]:
+            cache[1] = tuple(d[0] for d in description)
+            cache[0] = description
+        return dict(zip(cache[1], row))
+    
+    return _dict_factory
+
+# Translate an apsw exception into the matching sqlite3 one
+def _from_apsw_error(e: Exception) -> sqlite3.Error:
+    """
+    Map apsw errors onto sqlite3 errors so callers handle a single family
+    """
+    if isinstance(e, apsw.ConstraintError):
+        return sqlite3.IntegrityError(str(e))
+    return sqlite3.OperationalError(str(e))
+
+# apsw Cursor Adapter
+class _ApswCursor:
+    """
+    sqlite3.Cursor-like wrapper over an apsw cursor, rows are dictionaries
+    """
+    
+    __slots__ = ("conn", "cursor", "names", "rowcount", "lastrowid")
+    
+    def __init__(self, conn: '_ApswConnection'):
+        self.conn = conn
+        self.cursor = conn.raw.cursor()
+        self.cursor.setrowtrace(self._dict_row)
+        self.names: Optional[tuple] = None
+        self.rowcount = -1
+        self.lastrowid: Optional[int] = None
+
+    def _dict_row(self, cursor: Any, row: tuple) -> Dict[str, Any]:
+        if self.names is None:
+            self.names = tuple(d[0] for d in cursor.getdescription())
+        return dict(zip(self.names, row))
+
+    def _stamp(self) -> '_ApswCursor':
+        raw = self.conn.raw
+        self.rowcount = raw.changes()
+        self.lastrowid = raw.last_insert_rowid()
+        return self
+
+    def execute(self, query: str, params: Union[tuple, Dict[str, Any]] = _EMPTY) -> '_ApswCursor':
+        self.names = None
+        try:
+            self.cursor.execute(query, params)
+        except apsw.Error as e:
+            raise _from_apsw_error(e) from e
+        return self._stamp()
+
+    def executemany(self, query: str, params: List[Union[tuple, Dict[str, Any]]]) -> '_ApswCursor':
+        self.names = None
+        try:
+            self.cursor.executemany(query, params)
+        except apsw.Error as e:
+            raise _from_apsw_error(e) from e
+        return self._stamp()
+
+    def executescript(self, script: str) -> '_ApswCursor':
+        # apsw runs every statement of a multi-statement string
+        return self.execute(script)
+
+    def fetchall(self) -> List[Dict[str, Any]]:
+        try:
+            return list(self.cursor)
+        except apsw.Error as e:
+            raise _from_apsw_error(e) from e
+
+    def close(self) -> None:
+        self.cursor.close()
+
+# apsw Connection Adapter
+class _ApswConnection:
+    """
+    sqlite3.Connection-like wrapper over an apsw connection
+    apsw runs in autocommit mode, commit/rollback only end explicit transactions
+    """
+    
+    __slots__ = ("raw",)
+    
+    def __init__(self, database: str, timeout: float = 5.0, **kwargs: Any):
+        # sqlite3-only options such as check_same_thread do not apply
+        try:
+            self.raw = apsw.Connection(database)
+            self.raw.setbusytimeout(int(timeout * 1000))
+        except apsw.Error as e:
+            raise _from_apsw_error(e) from e
+
+    def cursor(self) -> _ApswCursor:
+        return _ApswCursor(self)
+
+    def execute(self, query: str, params: Union[tuple, Dict[str, Any]] = _EMPTY) -> _ApswCursor:
+        return self.cursor().execute(query, params)
+
+    def commit(self) -> None:
+        if not self.raw.getautocommit():
+            self.execute("COMMIT")
+
+    def rollback(self) -> None:
+        if not self.raw.getautocommit():
+            self.execute("ROLLBACK")
+
+    def close(self) -> None:
+        self.raw.close()
+
+# A writer waiting for its group commit
+class _CommitWaiter:
+    """
+    Completion flag and outcome of one group-committed write
+    """
+    
+    __slots__ = ("event", "error")
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.error: Optional[BaseException] = None
+
+# SQLite Group Committer
+class _GroupCommitter:
+    """
+    Dedicated writer connection whose commits are coalesced
+    
+    Writes run immediately inside one open transaction; a background thread
+    commits every write queued during the last group_commit_ms at once,
+    so N committing writers pay for one fsync instead of N
+    """
+    
+    def __init__(self, conn: Any, group_commit_ms: float = 2.0):
+        self.conn = conn
+        self.delay = group_commit_ms / 1000.0
+        self._lock = threading.Lock()
+        # Flush requests are a flag guarded by _lock, so a wakeup cannot be lost
+        # between the background thread's flush and its next wait
+        self._wakeup = threading.Condition(self._lock)
+        self._requested = False
+        self._pending: List[_CommitWaiter] = []
+        self._open = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="sqlite-group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, work: Any) -> Any:
+        """
+        Run work(conn) on the writer connection and wait for its commit
+        
+        :param work: Callable receiving the writer connection
+        :return: Return value of work
+        :raises sqlite3.Error: If the statement or the group commit fails
+        """
+        waiter = _CommitWaiter()
+        with self._lock:
+            if self._closed:
+                raise PoolError("Group committer is closed")
+            if not self._open:
+                self.conn.execute("BEGIN")
+                self._open = True
+            try:
+                # A failing statement only rolls back itself, not the batch
+                result = work(self.conn)
+            finally:
+                # Never leave the transaction open without a pending commit
+                self._requested = True
+                self._wakeup.notify()
+            self._pending.append(waiter)
+        
+        waiter.event.wait()
+        if waiter.error is not None:
+            raise waiter.error
+        return result
+
+    def _flush(self) -> None:
+        """
+        Commit the open transaction and release every waiter of the batch
+        """
+        with self._lock:
+            self._requested = False
+            waiters, self._pending = self._pending, []
+            error = None
+            if self._open:
+                try:
+                    self.conn.commit()
+                except sqlite3.Error as e:
+                    logger.error("Group commit failed: %s", e)
+                    error = e
+                    self.conn.rollback()
+                self._open = False
+        for waiter in waiters:
+            waiter.error = error
+            waiter.event.set()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not (self._requested or self._closed):
+                    self._wakeup.wait()
+                closed = self._closed
+            if closed:
+                break
+            # Let concurrent writers join this batch
+            time.sleep(self.delay)
+            self._flush()
+        self._flush()
+
+    def close(self) -> None:
+        """
+        Commit whatever is pending, stop the thread and close the connection
+        """
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        self._thread.join()
+        self.conn.close()
+
 # SQLite Connection Pool - Allowing multiple connections
 class ConnectionPool:
     """
     Thread-safe SQLite connection pool implementation
     """
     
-    def __init__(self, database: str, pool_size: int = 5, **kwargs: Any):
+    def __init__(
+        self,
+        database: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        backend: str = "sqlite3",
+        group_commit_ms: Optional[float] = None,
+        **kwargs: Any
+    ):
         """
         Initialize connection pool
         
         :param database: Database file path
         :param pool_size: Maximum number of connections in the pool
+        :param backend: "sqlite3" (stdlib) or "apsw" if installed
+        :param group_commit_ms: If set, coalesce committing writes on a dedicated
+                                writer connection within this many milliseconds
         :param kwargs: Additional SQLite connection parameters
         """
+        if backend not in ("sqlite3", "apsw"):
+            raise ValueError(f"Unknown SQLite backend '{backend}'")
+        if backend == "apsw" and apsw is None:
+            logger.warning("apsw is not installed, falling back to sqlite3")
+            backend = "sqlite3"
+        
         self.database = database
         self.pool_size = pool_size
+        self.backend = backend
         self.kwargs = kwargs
+        # pragmas holds what every connection is configured with, _target what
+        # was requested; connections lagging behind _version are synced lazily
+        self.pragmas: Dict[str, Any] = {}
+        self._target: Dict[str, Any] = {}
+        self._version = 0
+        self._conn_versions: Dict[int, int] = {}
         self._pool: queue.Queue = queue.Queue(maxsize=pool_size)
         self._connections_created = 0
         self._lock = threading.Lock()
+        self._closed = False
         
         for _ in range(pool_size):
             self._create_connection()
+        
+        # Optional writer connection with group commit
+        self.group_committer: Optional[_GroupCommitter] = None
+        if group_commit_ms is not None:
+            self.group_committer = _GroupCommitter(self._connect(), group_commit_ms)
 
-    def _create_connection(self) -> None:
+    def _connect(self) -> Any:
         """
-        Create a new connection and add it to the pool
+        Open a new connection for the configured backend
         """
         try:
-            conn = sqlite3.connect(self.database, **self.kwargs)
-            conn.row_factory = sqlite3.Row
-            self._pool.put(conn)
-            with self._lock:
-                self._connections_created += 1
+            if self.backend == "apsw":
+                conn = _ApswConnection(self.database, **self.kwargs)
+            else:
+                # No connection-wide row factory: writes never build row
+                # objects, fetch_all installs one on its own cursor
+                conn = sqlite3.connect(self.database, **self.kwargs)
         except sqlite3.Error as e:
-            logger.error(f"Connection creation failed: {str(e)}")
+            logger.error("Connection creation failed: %s", e)
             raise ConnectionError(f"Failed to create connection: {str(e)}") from e
+        self._sync_pragmas(conn)
+        with self._lock:
+            self._connections_created += 1
+        return conn
+
+    @staticmethod
+    def _apply_pragmas(conn: Any, pragmas: Dict[str, Any]) -> None:
+        """
+        Run PRAGMA statements on one connection, failures are only logged
+        """
+        for name, value in pragmas.items():
+            try:
+                conn.execute(f"PRAGMA {name} = {value}").fetchall()
+            except sqlite3.Error as e:
+                logger.warning("PRAGMA %s = %s failed: %s", name, value, e)
+
+    def _sync_pragmas(self, conn: Any) -> None:
+        """
+        Bring one connection up to the requested PRAGMAs if it lags behind
+        Must be called by the thread currently holding the connection
+        """
+        key = id(conn)
+        with self._lock:
+            version = self._version
+            if self._conn_versions.get(key) == version:
+                return
+            target = dict(self._target)
+        self._apply_pragmas(conn, target)
+        with self._lock:
+            if self._conn_versions.get(key, -1) < version:
+                self._conn_versions[key] = version
+            self._update_applied()
+
+    def _update_applied(self) -> None:
+        """
+        Record the requested PRAGMAs as applied once no connection lags (lock held)
+        """
+        if all(v == self._version for v in self._conn_versions.values()):
+            self.pragmas = dict(self._target)
+
+    def apply_pragmas(self, pragmas: Dict[str, Any]) -> bool:
+        """
+        Apply PRAGMAs to every connection, now and for connections created later
+        Most PRAGMAs are per connection: idle connections are configured right
+        away, checked-out ones when they are next returned or borrowed
+        
+        :param pragmas: Mapping of PRAGMA name to value
+        :return: False if all of them were already applied
+        """
+        with self._lock:
+            if all(name in self.pragmas and self.pragmas[name] == value
+                   for name, value in pragmas.items()):
+                return False
+            if any(name not in self._target or self._target[name] != value
+                   for name, value in pragmas.items()):
+                self._target.update(pragmas)
+                self._version += 1
+        
+        # Configure the idle connections without waiting for busy ones
+        idle = []
+        try:
+            while True:
+                try:
+                    conn = self._pool.get(block=False)
+                except queue.Empty:
+                    break
+                idle.append(conn)
+                self._sync_pragmas(conn)
+        finally:
+            for conn in idle:
+                self.return_connection(conn)
+        
+        if self.group_committer is not None:
+            with self.group_committer._lock:
+                self._sync_pragmas(self.group_committer.conn)
+        return True
+
+    def _create_connection(self) -> None:
+        """
+        Create a new connection and add it to the pool
+        """
+        self._pool.put(self._connect())
 
     def get_connection(self, timeout: float = 5.0) -> sqlite3.Connection:
         """
@@ -106,11 +462,18 @@ class ConnectionPool:
         :param timeout: Maximum wait time in seconds
         :return: SQLite connection object
         """
+        if self._closed:
+            raise PoolError("Connection pool is closed")
         try:
-            return self._pool.get(block=True, timeout=timeout)
+            conn = self._pool.get(block=True, timeout=timeout)
         except queue.Empty as e:
+            # The pool may have been closed (and drained) while waiting
+            if self._closed:
+                raise PoolError("Connection pool is closed") from e
             logger.error("Connection pool exhausted")
             raise PoolError("No available connections in the pool") from e
+        self._sync_pragmas(conn)
+        return conn
 
     def return_connection(self, conn: sqlite3.Connection) -> None:
         """
@@ -119,35 +482,131 @@ class ConnectionPool:
         :param conn: Connection to return
         """
         if conn is not None:
-            try:
-                self._pool.put(conn, block=False)
-            except queue.Full:
-                logger.warning("Connection pool full, closing connection")
-                conn.close()
+            if not self._closed:
+                # Catch up on PRAGMAs requested while it was checked out
+                self._sync_pragmas(conn)
+            with self._lock:
+                # Pool already shut down, do not enqueue
+                if self._closed:
+                    self._conn_versions.pop(id(conn), None)
+                    conn.close()
+                    return
+                try:
+                    self._pool.put(conn, block=False)
+                except queue.Full:
+                    logger.warning("Connection pool full, closing connection")
+                    self._conn_versions.pop(id(conn), None)
+                    self._update_applied()
+                    conn.close()
 
     def close_all(self) -> None:
         """
         Close all connections in the pool
+        Connections returned afterwards are closed directly
         """
-        while not self._pool.empty():
-            conn = self._pool.get_nowait()
-            conn.close()
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            while True:
+                try:
+                    conn = self._pool.get(block=False)
+                except queue.Empty:
+                    break
+                self._conn_versions.pop(id(conn), None)
+                conn.close()
+            # The drained queue is kept, so threads still inside get_connection
+            # time out on it and see the closed pool instead of None
+        
+        if self.group_committer is not None:
+            self.group_committer.close()
+
+# Cursor Context Manager
+class _CursorContext:
+    """
+    Open a cursor on enter and close it on exit
+    """
+    
+    __slots__ = ("conn", "cursor")
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.cursor: Optional[sqlite3.Cursor] = None
+
+    def __enter__(self) -> sqlite3.Cursor:
+        self.cursor = self.conn.cursor()
+        return self.cursor
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> bool:
+        self.cursor.close()
+        return False
+
+# Connection Context Manager
+class _ConnectionContext:
+    """
+    Borrow a pooled connection on enter and return it on exit
+    Reuses the connection already checked out by the current thread
+    """
+    
+    __slots__ = ("client", "conn", "owned")
+    
+    def __init__(self, client: 'SQLiteClient'):
+        self.client = client
+        self.conn: Optional[sqlite3.Connection] = None
+        self.owned = False
+
+    def __enter__(self) -> sqlite3.Connection:
+        tls = self.client._tls
+        conn = getattr(tls, "conn", None)
+        if conn is None:
+            conn = self.client.pool.get_connection()
+            tls.conn = conn
+            self.owned = True
+        self.conn = conn
+        return conn
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> bool:
+        try:
+            if exc_type is not None and issubclass(exc_type, sqlite3.Error):
+                self.conn.rollback()
+                logger.error("Operation failed: %s", exc_val)
+                raise QueryExecutionError(str(exc_val)) from exc_val
+        finally:
+            if self.owned:
+                # Only the outermost scope hands the connection back
+                self.client._tls.conn = None
+                self.client.pool.return_connection(self.conn)
+        return False
 
 # SQLite Client Instance - API
 class SQLiteClient:
     """Main client class for SQLite database operations"""
     
-    def __init__(self, database: str, pool_size: int = 5, **kwargs: Any):
+    def __init__(
+        self,
+        database: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        backend: str = "sqlite3",
+        group_commit_ms: Optional[float] = None,
+        **kwargs: Any
+    ):
         """
         Initialize SQLite client
         
         :param database: Database file path
         :param pool_size: Connection pool size
+        :param backend: "sqlite3" (stdlib) or "apsw" for the thinner binding
+        :param group_commit_ms: If set, execute/executemany with commit=True are
+                                committed in groups (trading a few ms of latency
+                                for fewer fsyncs under heavy write load)
         :param kwargs: Additional connection parameters
         """
-        # If database notexiting, create
-        if os.path.exists(os.path.dirname(database)) == False:
-            os.makedirs(os.path.dirname(database))
+        # If database directory not existing, create
+        # (nothing to do for in-memory databases or bare filenames)
+        if database != ":memory:":
+            dirname = os.path.dirname(database)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
         
         self.__author__ = "DOF-Studio/NathMath@bilibili"
         self.__license__ = "Apache License Version 2.0"
@@ -155,42 +614,68 @@ class SQLiteClient:
         self.pool = ConnectionPool(
             database=database,
             pool_size=pool_size,
+            backend=backend,
+            group_commit_ms=group_commit_ms,
             check_same_thread=False,
             **kwargs
         )
-        logger.info(f"Initialized SQLite client for database: {database}")
+        
+        # Thread-local holder for a checked-out connection
+        self._tls = threading.local()
+        
+        # Generated multi-row INSERT statements, keyed by (table, columns, batch)
+        self._bulk_sql_cache: Dict[tuple, str] = {}
+        logger.info("Initialized SQLite client for database: %s", database)
 
-    @contextmanager
-    def _get_cursor(self, conn: sqlite3.Connection) -> Iterator[sqlite3.Cursor]:
+    def _get_cursor(self, conn: sqlite3.Connection) -> '_CursorContext':
         """
         Context manager for cursor handling
         """
-        cursor = conn.cursor()
-        try:
-            yield cursor
-        finally:
-            cursor.close()
+        return _CursorContext(conn)
 
-    @contextmanager
-    def connection(self) -> Iterator[sqlite3.Connection]:
+    def connection(self) -> '_ConnectionContext':
         """
         Context manager for connection handling
+        Reuses the connection checked out by this thread if any
+        """
+        return _ConnectionContext(self)
+
+    # Keep one pooled connection checked out for a logical unit of work
+    def session(self) -> '_ConnectionContext':
+        """
+        Bracket several queries with one pool borrow
+        
+        Usage:
+            with client.session():
+                client.execute(...)
+                client.fetch_all(...)
+        """
+        return self.connection()
+
+    # Run a committing write on the group-commit writer connection
+    def _group_write(self, query: str, params: Any, many: bool = False) -> Optional[int]:
+        """
+        Execute a write and block until its group commit completes
         """
-        conn = self.pool.get_connection()
+        def work(conn: Any) -> Optional[int]:
+            with self._get_cursor(conn) as cursor:
+                if many:
+                    cursor.executemany(query, params)
+                    return None
+                cursor.execute(query, params)
+                return cursor.lastrowid
+        
         try:
-            yield conn
+            return self.pool.group_committer.submit(work)
         except sqlite3.Error as e:
-            conn.rollback()
-            logger.error(f"Operation failed: {str(e)}")
+            logger.error("Query failed: %s - %s", query, e)
             raise QueryExecutionError(str(e)) from e
-        finally:
-            self.pool.return_connection(conn)
 
     # Execute a SQL query but not SELECT query
     def execute(
         self,
         query: str,
-        params: Optional[Union[tuple, Dict[str, Any]]] = None,
+        params: Optional[Union[tuple, Dict[str, Any]]] = _EMPTY,
         commit: bool = False
     ) -> Optional[int]:
         """
@@ -201,15 +686,19 @@ class SQLiteClient:
         :param commit: Whether to commit transaction
         :return: Last row ID if applicable
         """
+        params = _EMPTY if params is None else params
+        if commit and self.pool.group_committer is not None:
+            return self._group_write(query, params)
+        
         with self.connection() as conn:
             try:
                 with self._get_cursor(conn) as cursor:
-                    cursor.execute(query, params or ())
+                    cursor.execute(query, params)
                     if commit:
                         conn.commit()
                     return cursor.lastrowid
             except sqlite3.Error as e:
-                logger.error(f"Query failed: {query} - {str(e)}")
+                logger.error("Query failed: %s - %s", query, e)
                 conn.rollback()
                 raise QueryExecutionError(str(e)) from e
                 
@@ -227,6 +716,10 @@ class SQLiteClient:
         :param params: List of query parameters
         :param commit: Whether to commit transaction
         """
+        if commit and self.pool.group_committer is not None:
+            self._group_write(query, params, many=True)
+            return
+        
         with self.connection() as conn:
             try:
                 with self._get_cursor(conn) as cursor:
@@ -234,15 +727,93 @@ class SQLiteClient:
                     if commit:
                         conn.commit()
             except sqlite3.Error as e:
-                logger.error(f"Bulk operation failed: {query} - {str(e)}")
+                logger.error("Bulk operation failed: %s - %s", query, e)
+                conn.rollback()
+                raise QueryExecutionError(str(e)) from e
+                
+    # Execute a SQL script of several statements
+    def executescript(self, script: str, commit: bool = False) -> None:
+        """
+        Execute a SQL script (multiple statements separated by ;)
+        
+        :param script: SQL script string
+        :param commit: Whether to commit transaction
+        """
+        with self.connection() as conn:
+            try:
+                with self._get_cursor(conn) as cursor:
+                    cursor.executescript(script)
+                    if commit:
+                        conn.commit()
+            except sqlite3.Error as e:
+                logger.error("Script failed: %s - %s", script, e)
                 conn.rollback()
                 raise QueryExecutionError(str(e)) from e
+    
+    # Get (or build) a multi-row INSERT statement
+    def _bulk_insert_sql(self, table: str, columns: tuple, batch: int) -> str:
+        """
+        Build INSERT INTO table (cols) VALUES (?,...),(?,...),... for batch rows
+        """
+        key = (table, columns, batch)
+        sql = self._bulk_sql_cache.get(key)
+        if sql is None:
+            row = "(" + ", ".join(["?"] * len(columns)) + ")"
+            sql = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES " +
+                   ", ".join([row] * batch))
+            self._bulk_sql_cache[key] = sql
+        return sql
+    
+    # Insert many rows using the multi-row VALUES form
+    def bulk_insert(
+        self,
+        table: str,
+        columns: List[str],
+        rows: List[Union[tuple, list]],
+        batch: int = 500,
+        commit: bool = False
+    ) -> int:
+        """
+        Insert rows in batches of one multi-row INSERT statement each
+        
+        :param table: Target table name
+        :param columns: Column names, in the order of the row values
+        :param rows: List of row value sequences
+        :param batch: Maximum number of rows per statement
+        :param commit: Whether to commit transaction
+        :return: Number of rows inserted
+        """
+        columns = tuple(columns)
+        if not columns:
+            raise ValueError("At least one column is required for bulk insert")
+        
+        # Keep each statement within the host parameter limit
+        batch = max(1, min(batch, _MAX_VARIABLES // len(columns)))
+        full = len(rows) - len(rows) % batch
+        
+        with self.connection() as conn:
+            try:
+                with self._get_cursor(conn) as cursor:
+                    if full:
+                        sql = self._bulk_insert_sql(table, columns, batch)
+                        for start in range(0, full, batch):
+                            cursor.execute(sql, tuple(itertools.chain.from_iterable(rows[start:start + batch])))
+                    # Trailing partial batch
+                    if full < len(rows):
+                        cursor.executemany(self._bulk_insert_sql(table, columns, 1), rows[full:])
+                    if commit:
+                        conn.commit()
+            except sqlite3.Error as e:
+                logger.error("Bulk insert failed: %s - %s", table, e)
+                conn.rollback()
+                raise QueryExecutionError(str(e)) from e
+        return len(rows)
                 
     # Execute a SELECT querys and return fetched data
     def fetch_all(
         self,
         query: str,
-        params: Optional[Union[tuple, Dict[str, Any]]] = None
+        params: Optional[Union[tuple, Dict[str, Any]]] = _EMPTY
     ) -> List[Dict[str, Any]]:
         """
         Fetch all results from query
@@ -251,15 +822,35 @@ class SQLiteClient:
         :param params: Query parameters
         :return: List of result rows as dictionaries
         """
+        params = _EMPTY if params is None else params
         with self.connection() as conn:
             try:
                 with self._get_cursor(conn) as cursor:
-                    cursor.execute(query, params or ())
-                    return [dict(row) for row in cursor.fetchall()]
+                    if self.pool.backend == "sqlite3":
+                        cursor.row_factory = _make_dict_factory()
+                    cursor.execute(query, params)
+                    return cursor.fetchall()
             except sqlite3.Error as e:
-                logger.error(f"Fetch failed: {query} - {str(e)}")
+                logger.error("Fetch failed: %s - %s", query, e)
                 raise QueryExecutionError(str(e)) from e
                 
+    # Configure every connection of the client
+    def apply_pragmas(self, pragmas: Dict[str, Any]) -> bool:
+        """
+        Apply PRAGMAs (e.g. journal_mode, synchronous) to all connections
+        
+        :param pragmas: Mapping of PRAGMA name to value
+        :return: False if all of them were already applied
+        """
+        return self.pool.apply_pragmas(pragmas)
+    
+    # Let SQLite refresh its query planner statistics
+    def optimize(self) -> None:
+        """
+        Run PRAGMA optimize, typically right before closing the database
+        """
+        self.execute("PRAGMA optimize")
+                
     # Return a transaction manager for atomic operations
     def transaction(self) -> 'TransactionManager':
         """
@@ -276,12 +867,23 @@ class TransactionManager:
     def __init__(self, client: SQLiteClient):
         self.client = client
         self.conn: Optional[sqlite3.Connection] = None
+        self.cursor: Optional[sqlite3.Cursor] = None
         self.__author__ = "DOF-Studio/NathMath@bilibili"
         self.__license__ = "Apache License Version 2.0"
 
     def __enter__(self) -> 'TransactionManager':
         self.conn = self.client.pool.get_connection()
-        self.conn.execute('BEGIN')
+        try:
+            # Take the write lock up front instead of upgrading on first write
+            self.conn.execute('BEGIN IMMEDIATE')
+        except sqlite3.Error as e:
+            self.client.pool.return_connection(self.conn)
+            self.conn = None
+            logger.error("Transaction begin failed: %s", e)
+            raise QueryExecutionError(str(e)) from e
+        
+        # One cursor reused by every statement of the transaction
+        self.cursor = self.conn.cursor()
         return self
 
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
@@ -292,25 +894,43 @@ class TransactionManager:
                 else:
                     self.conn.commit()
             except sqlite3.Error as e:
-                logger.error(f"Transaction failed: {str(e)}")
+                logger.error("Transaction failed: %s", e)
                 raise QueryExecutionError(str(e)) from e
             finally:
+                self.cursor.close()
+                self.cursor = None
                 self.client.pool.return_connection(self.conn)
+                self.conn = None
 
-    def execute(self, query: str, params: Optional[Union[tuple, Dict[str, Any]]] = None) -> sqlite3.Cursor:
+    def execute(self, query: str, params: Optional[Union[tuple, Dict[str, Any]]] = _EMPTY) -> sqlite3.Cursor:
         """
         Execute within transaction context
         Translate ?, ?, ... into specified param values
+        The returned cursor is shared by the whole transaction,
+        read rowcount/lastrowid before the next execute
         """
         if not self.conn:
             raise ConnectionError("Not in transaction context")
         
+        params = _EMPTY if params is None else params
         try:
-            with self.client._get_cursor(self.conn) as cursor:
-                cursor.execute(query, params or ())
-                return cursor
+            return self.cursor.execute(query, params)
         except sqlite3.Error as e:
-            logger.error(f"Transactional query failed: {query} - {str(e)}")
+            logger.error("Transactional query failed: %s - %s", query, e)
+            raise QueryExecutionError(str(e)) from e
+
+    def executemany(self, query: str, params: List[Union[tuple, Dict[str, Any]]]) -> sqlite3.Cursor:
+        """
+        Execute a statement for every parameter set within transaction context
+        The statement is prepared once and rows are bound in a C loop
+        """
+        if not self.conn:
+            raise ConnectionError("Not in transaction context")
+        
+        try:
+            return self.cursor.executemany(query, params)
+        except sqlite3.Error as e:
+            logger.error("Transactional bulk query failed: %s - %s", query, e)
             raise QueryExecutionError(str(e)) from e
 
 # Usage Example
@@ -339,3 +959,34 @@ if __name__ == '__main__':
     with db_client.transaction() as tx:
         tx.execute("UPDATE users SET email = ? WHERE id = ?", ('alice_new@example.com', user_id))
         tx.execute("INSERT INTO users (name, email) VALUES (?, ?)", ('Bob', 'bob@example.com'))
+    
+    # Group commit: closing the pool after a failed grouped write must not hang
+    gc_client = SQLiteClient(':memory:', pool_size=1, group_commit_ms=20)
+    gc_client.execute("CREATE TABLE t (id INTEGER PRIMARY KEY)", commit=True)
+    gc_client.execute("INSERT INTO t VALUES (1)", commit=True)
+    try:
+        gc_client.execute("INSERT INTO t VALUES (1)", commit=True)
+    except QueryExecutionError:
+        pass
+    closer = threading.Thread(target=gc_client.pool.close_all, daemon=True)
+    closer.start()
+    closer.join(5.0)
+    assert not closer.is_alive(), "close_all hung after a failed grouped write"
+    
+    # PRAGMAs: checked-out connections are configured on return, without blocking
+    pr_client = SQLiteClient(':memory:', pool_size=2)
+    with pr_client.session() as held:
+        assert pr_client.apply_pragmas({"cache_size": -4000})
+        assert pr_client.pool.pragmas == {}
+    assert held.execute("PRAGMA cache_size").fetchone()[0] == -4000
+    assert pr_client.pool.pragmas == {"cache_size": -4000}
+    assert not pr_client.apply_pragmas({"cache_size": -4000})
+    pr_client.pool.close_all()
+    
+    # An explicit params=None is accepted like the default
+    none_client = SQLiteClient(':memory:', pool_size=1)
+    none_client.execute("CREATE TABLE n (v INTEGER)", None, commit=True)
+    assert none_client.fetch_all("SELECT 1 AS one", None) == [{"one": 1}]
+    with none_client.transaction() as tx:
+        tx.execute("INSERT INTO n VALUES (1)", None)
+    none_client.pool.close_all()
@@ -10,14 +10,51 @@
 # Backend #####################################################################
 
 import re
+import atexit
 import logging
-import pandas as pd
-from typing import List, Dict, Union, Optional, Any
-from sqlite import SQLiteClient, QueryExecutionError
+import weakref
+from typing import List, Dict, Union, Optional, Any, Iterable, Tuple
+from sqlite import SQLiteClient, SQLiteError, QueryExecutionError
 
 # Global sqlite logger
 logger = logging.getLogger('sqlite_parser')
 
+# DSL select syntax, with ordered clause handling
+_SELECT_RE = re.compile(r'''
+    \\select\s+       # Start with \select
+    (?P<conditions>.*?)  # Capture conditions (non-greedy)
+    (?=               # Lookahead for possible clauses
+        \\columns\b   # \columns marker
+        | \\from\b    # \from marker
+        | \\select\b  # End marker
+    )
+    (?:               # Non-capturing group for optional clauses
+        (\\columns\s+(?P<columns>.*?))?  # Columns clause
+        (?:\\from\s+(?P<table>.*?))?     # Table clause
+        | (\\from\s+(?P<table2>.*?))?    # Table clause alternative order
+        (?:\\columns\s+(?P<columns2>.*?))? 
+    )
+    \\select          # End marker
+''', re.DOTALL | re.IGNORECASE | re.VERBOSE)
+
+# Result column naming the candidate a selected row matched
+_CANDIDATE_TAG = "__candidate__"
+
+# Clients whose planner statistics are refreshed at exit, one per database path;
+# held weakly, so clients dropped on a relocate are not kept alive until exit
+_OPTIMIZE_AT_EXIT: 'weakref.WeakValueDictionary[str, SQLiteClient]' = weakref.WeakValueDictionary()
+
+# Refresh planner statistics before the interpreter exits
+def _optimize_at_exit() -> None:
+    for client in list(_OPTIMIZE_AT_EXIT.values()):
+        try:
+            client.optimize()
+        except SQLiteError:
+            # Pool may already be closed
+            pass
+
+atexit.register(_optimize_at_exit)
+
 class SQLiteParser:
     """
     DSL parser for SQLite operations with safe query generation
@@ -33,11 +70,33 @@ class SQLiteParser:
         None:  "NULL"
     }
     
+    # Declared column type to Python type, for value conversion
+    _TYPE_MAP = {
+        'INTEGER': int,
+        'REAL': float,
+        'TEXT': str,
+        'BLOB': bytes
+    }
+    
+    # Throughput PRAGMAs applied once per client
+    PERFORMANCE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "busy_timeout": 5000
+    }
+    
     # Constructor
     def __init__(self, client: SQLiteClient, default_table: str):
         """
         Initialize parser with connected client and default table
         
+        The client keeps a pool of long-lived connections (configured with
+        PERFORMANCE_PRAGMAS below); every parser call borrows from it, so a
+        parser can be shared between threads.
+        
         :param client: Initialized SQLiteClient instance
         :param default_table: Default table name for operations
         """
@@ -47,9 +106,14 @@ class SQLiteParser:
         # NathMath@bili+bili ~ DOF-S?tudio!
         self.client = client
         self.default_table = default_table
-        self.table_schemas: Dict[str, dict] = {}
         
-        # Initialize schema cache
+        # Configure the client for throughput (no-op if already done)
+        if self.client.apply_pragmas(self.PERFORMANCE_PRAGMAS):
+            _OPTIMIZE_AT_EXIT[self.client.pool.database] = self.client
+        
+        # Initialize schema cache (valid while PRAGMA schema_version is unchanged)
+        self.table_schemas: Dict[str, dict] = {}
+        self._schema_version = -1
         self._refresh_schema_cache()
         
         # Tags? Haha
@@ -59,27 +123,74 @@ class SQLiteParser:
         # It is a FREE and OPEN SOURCED software
         # See github.com/dof-studio/NathUI
 
+    # Read the schema cookie, bumped by SQLite on every schema change
+    def _read_schema_version(self) -> int:
+        """
+        Read PRAGMA schema_version (a cheap integer read)
+        """
+        return self.client.fetch_all("PRAGMA schema_version")[0]['schema_version']
+    
+    # Cache the schema of a single table
+    def _cache_table_schema(self, table_name: str) -> None:
+        """
+        Cache schema information of one table from database
+        """
+        schema = self.client.fetch_all(
+            f"PRAGMA table_info({table_name})"
+        )
+        # NathMath@bilibili and DOF-Studio
+        self.table_schemas[table_name] = self._build_table_schema(
+            {col['name']: col for col in schema}
+        )
+    
+    # Build the cached schema entry of one table from its columns
+    @staticmethod
+    def _build_table_schema(columns: Dict[str, dict]) -> dict:
+        """
+        Build the cached schema entry of one table
+        Derived names, types and keys are immutable tuples, shared safely between calls
+        
+        :param columns: Column name to PRAGMA table_info row, in cid order
+        """
+        return {
+            'columns': columns,
+            'column_set': frozenset(columns),
+            'col_names': tuple(columns),
+            'col_types': tuple(col['type'] for col in columns.values()),
+            'primary_key': tuple(name for name, col in columns.items() if col['pk'])
+        }
+    
     # Cache table schema information from database
     def _refresh_schema_cache(self) -> None:
         """
         Cache table schema information from database
+        Skipped entirely if the schema did not change since the last refresh
         """
-        tables = self.client.fetch_all(
-            "SELECT name FROM sqlite_master WHERE type='table'"
-        )
-        for table in tables:
-            table_name = table['name']
-            schema = self.client.fetch_all(
-                f"PRAGMA table_info({table_name})"
+        # Probe and reload on one pooled connection
+        with self.client.session():
+            version = self._read_schema_version()
+            if version == self._schema_version:
+                return
+            
+            # Columns of every table in one query instead of one PRAGMA per table
+            columns = self.client.fetch_all(
+                "SELECT m.name AS table_name, p.cid, p.name, p.type, "
+                "p.\"notnull\", p.dflt_value, p.pk "
+                "FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p "
+                "WHERE m.type = 'table' ORDER BY m.name, p.cid"
             )
-            # NathMath@bilibili and DOF-Studio
-            self.table_schemas[table_name] = {
-                'columns': {col['name']: col for col in schema},
-                'primary_key': [col['name'] for col in schema if col['pk']]
-            }
+        
+        # Rebuild, so that dropped tables disappear as well
+        table_columns: Dict[str, Dict[str, dict]] = {}
+        for col in columns:
+            table_name = col.pop('table_name')
+            table_columns.setdefault(table_name, {})[col['name']] = col
+        self.table_schemas = {table_name: self._build_table_schema(cols)
+                              for table_name, cols in table_columns.items()}
+        self._schema_version = version
 
     # Get primary key columns for a table
-    def _get_primary_key(self, table_name: str) -> List[str]:
+    def _get_primary_key(self, table_name: str) -> Tuple[str, ...]:
         """
         Get primary key columns for a table
         """
@@ -88,7 +199,7 @@ class SQLiteParser:
         return self.table_schemas[table_name]['primary_key']
     
     # Validate column names against table schema.
-    def _validate_columns(self, table: str, columns: List[str]) -> None:
+    def _validate_columns(self, table: str, columns: Iterable[str]) -> None:
         """
         Validate column names against table schema.
         
@@ -96,10 +207,11 @@ class SQLiteParser:
         :param columns: List of columns to validate
         :raises ValueError: For invalid columns
         """
-        valid_columns = self.table_schemas[table]['columns']
-        for col in columns:
-            if col not in valid_columns:
-                raise ValueError(f"Invalid column '{col}' in table '{table}'")
+        valid_columns = self.table_schemas[table]['column_set']
+        # One C-level subset test, find the offending column only on failure
+        if not valid_columns.issuperset(columns):
+            col = next(col for col in columns if col not in valid_columns)
+            raise ValueError(f"Invalid column '{col}' in table '{table}'")
     
     # Create table with schema definition (specified)
     def create_table(self, table_name: str, columns: List[Dict[str, Any]], safemode: bool = True) -> None:
@@ -154,23 +266,29 @@ class SQLiteParser:
             # In this circumstance it may raise an error
         
         self.client.execute(create_sql, commit=True)
-        self._refresh_schema_cache()
+        
+        # Only our CREATE happened since the last refresh: cache just this table
+        version = self._read_schema_version()
+        if version == self._schema_version + 1:
+            self._cache_table_schema(table_name)
+            self._schema_version = version
+        else:
+            self._refresh_schema_cache()
         logger.info(f"Created table {table_name} with schema: {columns}")
         
-    # Insert data into specified table
-    def insert(self, data: Union[List, Dict, List[Union[List, Dict]]], 
-               table_name: Optional[str] = None) -> List[Optional[int]]:
+    # Validate and convert records into the INSERT statement and its rows
+    def _prepare_insert(self, data: Union[List, Dict, List[Union[List, Dict]]], 
+                        table: str) -> tuple:
         """
-        Insert data into specified table
+        Validate and convert records for insertion
         
         :param data: Data to insert (single record or batch)
-        :param table_name: Target table name (defaults to configured table)
-        :return: List of inserted row IDs
+        :param table: Target table name
+        :return: (INSERT statement, list of ordered value lists)
         """
-        table = table_name or self.default_table
-        table = table.strip()
-        schema = self.table_schemas[table]['columns']
-        col_names = list(schema.keys())
+        table_schema = self.table_schemas[table]
+        col_names = table_schema['col_names']
+        col_types = table_schema['col_types']
         
         # Normalize input format
         if isinstance(data, dict):
@@ -180,41 +298,92 @@ class SQLiteParser:
         else:
             raise ValueError("Data must be a dictionary or a list of dictionaries.")
              
+        # Expected Python type per column, for the already-typed fast path
+        expected_types = [self._TYPE_MAP.get(col_type) for col_type in col_types]
+        text_indexes = [i for i, t in enumerate(expected_types) if t is str]
+        
         # Validate and convert data
         validated_data = []
         for item in data:
             # For a dict
             if isinstance(item, dict):
                 ordered_values = []
-                for col in col_names:
+                for col, col_type in zip(col_names, col_types):
                     if col not in item:
                         raise ValueError(f"Missing value for column {col}")
-                    ordered_values.append(self._convert_value(item[col], schema[col]['type']))
+                    ordered_values.append(self._convert_value(item[col], col_type))
                 validated_data.append(ordered_values)
             # For a list
             elif isinstance(item, list):
                 if len(item) != len(col_names):
                     raise ValueError(f"Expected {len(col_names)} values, got {len(item)}")
-                validated_data.append([self._convert_value(v, schema[col]['type']) 
-                                      for v, col in zip(item, col_names)])
+                # Natively typed row: no conversion, only strip text values
+                if list(map(type, item)) == expected_types:
+                    if text_indexes:
+                        item = item[:]
+                        for i in text_indexes:
+                            item[i] = item[i].strip()
+                    validated_data.append(item)
+                else:
+                    validated_data.append([self._convert_value(v, col_type) 
+                                          for v, col_type in zip(item, col_types)])
         
         # Generate parameter placeholders
         placeholders = ', '.join(['?'] * len(col_names))
         sql = f"INSERT INTO {table} ({', '.join(col_names)}) VALUES ({placeholders})"
+        return sql, validated_data
+    
+    # Insert prepared rows within an open transaction
+    def _insert_rows(self, tx, sql: str, rows: List[List[Any]]) -> List[int]:
+        """
+        Insert rows with one executemany call, the statement is prepared once
+        If any row fails, fall back to row-by-row insertion skipping failures
+        
+        :param tx: Open TransactionManager
+        :param sql: INSERT statement
+        :param rows: Ordered value lists
+        :return: Inserted row count per successfully inserted row
+        """
+        tx.execute("SAVEPOINT parser_insert")
+        try:
+            tx.executemany(sql, rows)
+        except QueryExecutionError:
+            # Undo the partial batch and retry one by one
+            tx.execute("ROLLBACK TO parser_insert")
+            row_ids = []
+            for values in rows:
+                try:
+                    # Get cursor and return inserted row_ids
+                    cursor = tx.execute(sql, values)
+                    row_ids.append(cursor.rowcount)
+                except QueryExecutionError as e:
+                    # Only log but not raise
+                    logger.error(f"Insert failed: {str(e)}")
+            tx.execute("RELEASE parser_insert")
+            return row_ids
+        tx.execute("RELEASE parser_insert")
+        
+        # Each plain INSERT adds exactly one row
+        return [1] * len(rows)
+        
+    # Insert data into specified table
+    def insert(self, data: Union[List, Dict, List[Union[List, Dict]]], 
+               table_name: Optional[str] = None) -> List[Optional[int]]:
+        """
+        Insert data into specified table
+        
+        :param data: Data to insert (single record or batch)
+        :param table_name: Target table name (defaults to configured table)
+        :return: List of inserted row counts, one per inserted record
+        """
+        table = table_name or self.default_table
+        table = table.strip()
+        sql, validated_data = self._prepare_insert(data, table)
         
         # Execute batch insert
         try:
             with self.client.transaction() as tx:
-                row_ids = []
-                for values in validated_data:
-                    try:
-                        # Get cursor and return inserted row_ids
-                        cursor = tx.execute(sql, values)
-                        row_ids.append(cursor.rowcount)
-                    except QueryExecutionError as e:
-                        # Only log but not raise
-                        logger.error(f"Insert failed: {str(e)}")
-                return row_ids
+                return self._insert_rows(tx, sql, validated_data)
         except Exception as e:
             logger.error(f"Insert failed: {str(e)}")
             raise
@@ -226,6 +395,9 @@ class SQLiteParser:
         
         Each record must be a dictionary containing at least the primary key field(s) to identify the row.
         Only non-primary key fields present in the record will be updated.
+        Records sharing the same columns share one prepared UPDATE statement; with coerce,
+        a record that matched no row is then inserted (a plain upsert would check NOT NULL
+        columns missing from a partial record before resolving the conflict).
         
         :param data: Data to update (a dict or a list of dicts).
         :param table_name: Target table name (defaults to the configured table).
@@ -237,11 +409,6 @@ class SQLiteParser:
         schema = self.table_schemas[table]['columns']
         primary_keys = self._get_primary_key(table)
         
-        if coerce == True:
-            # Get the existing pk values
-            pkvalues = self.client.fetch_all(f"SELECT {', '.join(primary_keys)} FROM {table}")
-            pkvalues = pd.DataFrame(pkvalues)
-        
         if not primary_keys:
             raise ValueError(f"Table '{table}' does not have a primary key defined, cannot perform update.")
     
@@ -253,92 +420,75 @@ class SQLiteParser:
         else:
             raise ValueError("Data must be a dictionary or a list of dictionaries.")
         
-        affected_rows = []
+        # Group records by their columns (primary keys first), one statement per group
+        groups: Dict[tuple, tuple] = {}
+        for index, record in enumerate(records):
+            # Validate that all provided columns exist in table schema
+            self._validate_columns(table, record.keys())
+            
+            # Ensure the record contains the primary key fields
+            for pk in primary_keys:
+                if pk not in record:
+                    raise ValueError(f"Missing primary key field '{pk}' in update data.")
+            
+            # Only update non-primary key columns
+            update_cols = tuple(col for col in record if col not in primary_keys)
+            if not update_cols:
+                raise ValueError("No columns to update provided (only primary key fields found).")
+            
+            cols = primary_keys + update_cols
+            rows, indexes = groups.setdefault(cols, ([], []))
+            rows.append([self._convert_value(record[col], schema[col]['type']) for col in cols])
+            indexes.append(index)
+        
+        affected_rows = [0] * len(records)
+        n_pk = len(primary_keys)
         
         with self.client.transaction() as tx:
-            for record in records:
-                # Validate that all provided columns exist in table schema
-                self._validate_columns(table, list(record.keys()))
-                
-                # Ensure the record contains the primary key fields
-                for pk in primary_keys:
-                    if pk not in record:
-                        raise ValueError(f"Missing primary key field '{pk}' in update data.")
-                
-                # Prepare SET clause: only update non-primary key columns
-                set_clauses = []
-                set_values = []
-                for col, val in record.items():
-                    if col in primary_keys:
-                        continue
-                    set_clauses.append(f"{col} = ?")
-                    set_values.append(self._convert_value(val, schema[col]['type']))
-                
-                if not set_clauses:
-                    raise ValueError("No columns to update provided (only primary key fields found).")
-                
-                # Prepare WHERE clause using primary key fields
-                where_clauses = []
-                where_values = []
-                for pk in primary_keys:
-                    where_clauses.append(f"{pk} = ?")
-                    where_values.append(self._convert_value(record[pk], schema[pk]['type']))
-                
-                sql = f"UPDATE {table} SET {', '.join(set_clauses)} WHERE {' AND '.join(where_clauses)}"
+            for cols, (rows, indexes) in groups.items():
+                update_cols = cols[n_pk:]
+                update_sql = (
+                    f"UPDATE {table} SET {', '.join(f'{col} = ?' for col in update_cols)} "
+                    f"WHERE {' AND '.join(f'{pk} = ?' for pk in primary_keys)}"
+                )
+                insert_sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join(['?'] * len(cols))})"
                 
-                try:
-                    # In the table
-                    count = 0
-                    for pk in primary_keys:
-                        if record[pk] in pkvalues[pk]:
-                            count += 1
-                    if count == len(primary_keys):
-                        cursor = tx.execute(sql, set_values + where_values)
-                        affected_rows.append(cursor.rowcount)  
-                    
-                    # Not in the table, insert
-                    else:
-                        ret = self.insert([record], table)[0]
-                        affected_rows.append(ret)
-                    
-                except Exception as e:
-                    logger.error(f"Update failed for record {record}: {str(e)}")
+                for row, index in zip(rows, indexes):
+                    # Update existing records
+                    try:
+                        cursor = tx.execute(update_sql, row[n_pk:] + row[:n_pk])
+                        affected_rows[index] = cursor.rowcount
+                    except QueryExecutionError as e:
+                        logger.error(f"Update failed for record {records[index]}: {str(e)}")
+                        raise
                     
-                    # If coerce, use insert to insert it again
-                    if coerce == True:
-                        ret = 0
+                    # Not in the table, insert if coerce
+                    if coerce == True and affected_rows[index] == 0:
                         try:
-                            ret = self.insert([record], table)[0]
-                            affected_rows.append(ret)
-                        except Exception as e:
-                            logger.error(f"Coerced update failed for record {record}: {str(e)}")
+                            affected_rows[index] = tx.execute(insert_sql, row).rowcount
+                        except QueryExecutionError as e:
+                            logger.error(f"Coerced update failed for record {records[index]}: {str(e)}")
                             raise
-                    else:
-                        raise
         
         return affected_rows
 
     # Value conversion (for SQLite Types)
     def _convert_value(self, value: Any, col_type: str) -> Any:
         """Convert value to appropriate SQLite type"""
-        if value is None:
-            return None
-            
-        type_map = {
-            'INTEGER': int,
-            'REAL': float,
-            'TEXT': str,
-            'BLOB': bytes
-        }
+        target = self._TYPE_MAP.get(col_type)
+        if target is None or value is None:
+            return value
+        
+        # Already the right type, no conversion needed
+        if type(value) is target:
+            return value.strip() if target is str else value
         
         try:
             # strip process
-            converted = type_map[col_type](value)
-            if isinstance(converted, str):
+            converted = target(value)
+            if target is str:
                 return converted.strip()
-            else:
-                return converted
-            return 
+            return converted
         except (ValueError, TypeError):
             logger.warning(f"Type conversion failed for {value} to {col_type}")
             return value
@@ -418,29 +568,7 @@ class SQLiteParser:
             'table': self.default_table
         }
         
-        # Enhanced regex pattern with ordered clause handling
-        pattern = r'''
-            \\select\s+       # Start with \select
-            (?P<conditions>.*?)  # Capture conditions (non-greedy)
-            (?=               # Lookahead for possible clauses
-                \\columns\b   # \columns marker
-                | \\from\b    # \from marker
-                | \\select\b  # End marker
-            )
-            (?:               # Non-capturing group for optional clauses
-                (\\columns\s+(?P<columns>.*?))?  # Columns clause
-                (?:\\from\s+(?P<table>.*?))?     # Table clause
-                | (\\from\s+(?P<table2>.*?))?    # Table clause alternative order
-                (?:\\columns\s+(?P<columns2>.*?))? 
-            )
-            \\select          # End marker
-        '''
-        
-        match = re.search(
-            pattern,
-            query,
-            re.DOTALL | re.IGNORECASE | re.VERBOSE
-        )
+        match = _SELECT_RE.search(query)
         
         if not match:
             raise ValueError("Invalid query syntax")
@@ -486,55 +614,77 @@ class SQLiteParser:
         pk_column = pk[0]
         pk_type = self.table_schemas[table]['columns'][pk_column]['type']
 
+        # Each group is one query; the CASE column tags every row with the first
+        # candidate it matches, so only the first matching candidate is kept
+        select_sql = f"SELECT {columns_sql}, CASE "
+        from_sql = f" END AS {_CANDIDATE_TAG} FROM {table} WHERE "
+
         # Parse condition groups
         results = []
         condition_groups = [g.strip() for g in components['conditions'].split(',') if g.strip()]
 
-        for group in condition_groups:
-            candidates = [c.strip() for c in group.split('|') if c.strip()]
-            for candidate in candidates:
-                # Handle fuzzy query syntax
-                if candidate.endswith('?'):
-                    fuzzy = True
-                    candidate = "'" + candidate[:-1].strip() + "%" + "'"
-                elif candidate.startswith('?'):
-                    fuzzy = True
-                    candidate = "'" + "%" + candidate[1:].strip() + "'"
-                elif candidate.find("?") > 0:
-                    fuzzy = True
-                    candidate = candidate.replace("?", "%")
-                # Not fuzzy
-                else:
-                    fuzzy = False
+        # One pooled connection for all groups of the query
+        with self.client.session():
+            for group in condition_groups:
+                candidates = [c.strip() for c in group.split('|') if c.strip()]
+                when_clauses = []
+                where_clauses = []
+                params = []
+                for candidate in candidates:
+                    # Handle fuzzy query syntax
+                    if candidate.endswith('?'):
+                        fuzzy = True
+                        candidate = candidate[:-1].strip() + "%"
+                    elif candidate.startswith('?'):
+                        fuzzy = True
+                        candidate = "%" + candidate[1:].strip()
+                    elif candidate.find("?") > 0:
+                        fuzzy = True
+                        candidate = candidate.replace("?", "%")
+                    # Not fuzzy
+                    else:
+                        fuzzy = False
 
-                try:
-                    converted = self._convert_value(candidate, pk_type)
-                except ValueError as e:
-                    logger.warning(f"Value conversion failed: {str(e)}")
+                    # Build parameterized condition
+                    if fuzzy:
+                        # The LIKE pattern is always bound as text
+                        condition = f"{pk_column} LIKE ?"
+                        params.append(candidate)
+                    else:
+                        try:
+                            converted = self._convert_value(candidate, pk_type)
+                        except ValueError as e:
+                            logger.warning(f"Value conversion failed: {str(e)}")
+                            continue
+                        condition = f"{pk_column} = ?"
+                        params.append(converted)
+                    when_clauses.append(f"WHEN {condition} THEN {len(when_clauses)}")
+                    where_clauses.append(condition)
+                
+                if not where_clauses:
                     continue
-
-                # Build parameterized query
-                if fuzzy:
-                    # ONLY IN THIS WAY, IT IS TRICKY
-                    sql = f"SELECT {columns_sql} FROM {table} WHERE {pk_column} LIKE {converted}"
-                    params = ()
-                else:
-                    sql = f"SELECT {columns_sql} FROM {table} WHERE {pk_column} = ?"
-                    params = (converted,)
                 
+                # CASE parameters, then the same ones again for WHERE
+                sql = select_sql + ' '.join(when_clauses) + from_sql + ' OR '.join(where_clauses)
                 try:
-                    result = self.client.fetch_all(sql, params)
-                    if result:
-                        results.extend(result)
-                        break  # Short-circuit on first match
+                    result = self.client.fetch_all(sql, params + params)
                 except QueryExecutionError as e:
                     logger.error(f"Query failed: {str(e)}")
                     continue
+                
+                # Short-circuit on first match
+                if result:
+                    first = min(row[_CANDIDATE_TAG] for row in result)
+                    for row in result:
+                        if row.pop(_CANDIDATE_TAG) == first:
+                            results.append(row)
 
         return results
 
     # Selected object to a pandas dataframe
     def to_pandas(self, selected_obj: Dict[str, Any]):
+        # Imported lazily, only needed when results are rendered
+        import pandas as pd
         return pd.DataFrame(selected_obj)
     
     def __repr__(self) -> str:
@@ -614,4 +764,26 @@ if __name__ == "__main__ pro (well dude, it wouldn't happen)":
     
     # Also use .to_markdown() to convert to markdown
     print("Query results:\n", parser.to_pandas(results))
-    
\ No newline at end of file
+    
+
+# Regression checks
+if __name__ == "__main__":
+    import os
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        client = SQLiteClient(os.path.join(tmpdir, 'update_check.db'))
+        client.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL, v REAL)", commit=True)
+        parser = SQLiteParser(client, 'items')
+        parser.insert({"id": 1, "name": "a", "v": 1.0})
+        
+        # Partial update of an existing row must not trip the NOT NULL name column
+        assert parser.update({"id": 1, "v": 9.0}) == [1]
+        # A full record that matches no row is inserted (coerce)
+        assert parser.update({"id": 2, "name": "b", "v": 2.0}) == [1]
+        assert client.fetch_all("SELECT * FROM items ORDER BY id") == [
+            {"id": 1, "name": "a", "v": 9.0},
+            {"id": 2, "name": "b", "v": 2.0},
+        ]
+        client.pool.close_all()
+    print("SQLiteParser.update: all checks passed")
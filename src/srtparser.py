@@ -9,10 +9,59 @@
 
 from bs4 import BeautifulSoup 
 import re
+import html
+import functools
+import numpy as np
+from array import array
+
+# Entry number and timing separator
+_NUM_RE = re.compile(r'^\d+$')
+_ARROW_RE = re.compile(r'\s*-->\s*')
+
+# Formatting tags and their attributes in subtitle text lines
+_TAG_RE = re.compile(r'<(/?)(\w+)([^>]*)>')
+_ATTR_RE = re.compile(r'([\w-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+
+# Number of entries joined per write in save()
+_SAVE_CHUNK_ENTRIES = 1000
+
+# Range of the C int milliseconds held by the array('i') time columns
+_MIN_MS, _MAX_MS = -2**31, 2**31 - 1
+
+# Opening tag string for a tag name and its attribute items
+@functools.lru_cache(maxsize=4096)
+def _opening_tag(name, attr_items):
+    attr_str = ' '.join([f'{key}="{value}"' for key, value in attr_items])
+    return f"<{name} {attr_str}>" if attr_str else f"<{name}>"
+
+# Opening and closing tag strings for a whole formatting list
+@functools.lru_cache(maxsize=4096)
+def _format_tags(tag_keys):
+    opening_tags = ''.join([_opening_tag(name, attr_items) for name, attr_items in tag_keys])
+    closing_tags = ''.join([f"</{name}>" for name, _ in reversed(tag_keys)])
+    return opening_tags, closing_tags
 
 class SRTParser:
     def __init__(self):
-        self.entries = []
+        # Entries stored as parallel arrays, one slot per subtitle entry
+        self.numbers = []
+        self.starts = array('i')     # start time in ms
+        self.ends = array('i')       # end time in ms
+        self.texts = []              # per entry, list of text lines
+        self.formattings = []        # per entry, list of formatting tag lists
+
+    @property
+    def entries(self):
+        # List-of-dicts snapshot of the entries, edit through the modify_* methods
+        return [{
+                    'number': number,
+                    'start': start,
+                    'end': end,
+                    'text_lines': [{'text': text, 'formatting': formatting}
+                                   for text, formatting in zip(texts, formattings)]
+                }
+                for number, start, end, texts, formattings
+                in zip(self.numbers, self.starts, self.ends, self.texts, self.formattings)]
 
     @staticmethod
     def parse_time(time_str):
@@ -22,104 +71,191 @@ class SRTParser:
 
     @staticmethod
     def format_time(total_ms):
-        hours = total_ms // 3600000
-        remaining = total_ms % 3600000
-        mins = remaining // 60000
-        remaining %= 60000
-        secs = remaining // 1000
-        millis = remaining % 1000
+        hours, remaining = divmod(total_ms, 3600000)
+        mins, remaining = divmod(remaining, 60000)
+        secs, millis = divmod(remaining, 1000)
         return f"{hours:02d}:{mins:02d}:{secs:02d},{millis:03d}"
 
+    @staticmethod
+    def _format_times(times):
+        # Vectorized format_time over a whole array('i') of milliseconds
+        if not times:
+            return []
+        total_ms = np.frombuffer(times, dtype=np.intc).astype(np.int64)
+        hours, remaining = np.divmod(total_ms, 3600000)
+        mins, remaining = np.divmod(remaining, 60000)
+        secs, millis = np.divmod(remaining, 1000)
+        return [f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+                for h, m, s, ms in zip(hours.tolist(), mins.tolist(), secs.tolist(), millis.tolist())]
+
     @staticmethod
     def build_opening_tag(tag_dict):
-        tag = tag_dict['name']
-        attrs = tag_dict['attrs']
-        attr_str = ' '.join([f'{key}="{value}"' for key, value in attrs.items()])
-        return f"<{tag} {attr_str}>" if attr_str else f"<{tag}>"
+        attr_items = tuple(tag_dict['attrs'].items())
+        try:
+            return _opening_tag(tag_dict['name'], attr_items)
+        except TypeError:
+            # Unhashable attribute values (e.g. multi-valued class lists)
+            return _opening_tag.__wrapped__(tag_dict['name'], attr_items)
 
     @staticmethod
     def build_closing_tag(tag_dict):
         return f"</{tag_dict['name']}>"
 
+    @staticmethod
+    def parse_text_line(line):
+        """
+        Split a subtitle text line into its plain text and formatting tags
+        Uses a regex tokenizer, BeautifulSoup only for lines it cannot handle
+        """
+        # Plain text, nothing to parse
+        if '<' not in line and '&' not in line:
+            return line, []
+        
+        formatting_tags = []
+        for closing, name, attr_str in _TAG_RE.findall(line):
+            if closing:
+                continue
+            attrs = {}
+            for match in _ATTR_RE.finditer(attr_str):
+                key, double, single, bare = match.groups()
+                value = double if double is not None else single if single is not None else bare
+                attrs[key.lower()] = value
+            # Valueless attributes or multi-valued class lists: let bs4 decide
+            if _ATTR_RE.sub('', attr_str).strip(' /') or 'class' in attrs:
+                return SRTParser._parse_text_line_bs4(line)
+            formatting_tags.append({'name': name.lower(), 'attrs': attrs})
+        
+        text = _TAG_RE.sub('', line)
+        # Stray angle brackets mean malformed markup
+        if '<' in text or '>' in text:
+            return SRTParser._parse_text_line_bs4(line)
+        return html.unescape(text), formatting_tags
+
+    @staticmethod
+    def _parse_text_line_bs4(line):
+        soup = BeautifulSoup(line, 'html.parser')
+        text = soup.get_text()
+        formatting_tags = [{'name': tag.name, 'attrs': tag.attrs} for tag in soup.find_all()]
+        return text, formatting_tags
+
     def parse(self, file_path):
+        # One read and a C-level split, then strip and drop blank lines
         with open(file_path, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f if line.strip()]
+            lines = [line for line in map(str.strip, f.read().splitlines()) if line]
         
-        current_entry = None
+        has_entry = False
         for line in lines:
-            if re.match(r'^\d+$', line):
-                if current_entry is not None:
-                    self.entries.append(current_entry)
-                current_entry = {
-                    'number': int(line),
-                    'start': None,
-                    'end': None,
-                    'text_lines': []  # Each line includes its text and formatting tags (with attributes)
-                }
+            if _NUM_RE.match(line):
+                has_entry = True
+                self.numbers.append(int(line))
+                # Entries without a timing line keep 0 ms
+                self.starts.append(0)
+                self.ends.append(0)
+                self.texts.append([])         # Each line's text
+                self.formattings.append([])   # and its formatting tags (with attributes)
             elif '-->' in line:
-                start_str, end_str = line.split(' --> ')
-                current_entry['start'] = self.parse_time(start_str.strip())
-                current_entry['end'] = self.parse_time(end_str.strip())
+                start_str, end_str = _ARROW_RE.split(line, 1)
+                self.starts[-1] = self.parse_time(start_str.strip())
+                self.ends[-1] = self.parse_time(end_str.strip())
             else:
-                if current_entry is not None:
-                    soup = BeautifulSoup(line, 'html.parser')
-                    text = soup.get_text()
-                    formatting_tags = [{'name': tag.name, 'attrs': tag.attrs} for tag in soup.find_all()]
-                    current_entry['text_lines'].append({
-                        'text': text,
-                        'formatting': formatting_tags
-                    })
-        if current_entry is not None:
-            self.entries.append(current_entry)
+                if has_entry:
+                    text, formatting_tags = self.parse_text_line(line)
+                    self.texts[-1].append(text)
+                    self.formattings[-1].append(formatting_tags)
+
+    def _has_line(self, entry_index, line_index):
+        return (0 <= entry_index < len(self.numbers) and 
+                0 <= line_index < len(self.texts[entry_index]))
+
+    @staticmethod
+    def _as_ms(value):
+        # Times are whole milliseconds; floats are truncated by int()
+        try:
+            ms = int(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Timestamp must be a number of milliseconds, got {value!r}") from e
+        if not _MIN_MS <= ms <= _MAX_MS:
+            raise ValueError(f"Timestamp {ms} ms is out of range")
+        return ms
 
     def modify_timestamps(self, entry_index, new_start, new_end):
-        if 0 <= entry_index < len(self.entries):
-            self.entries[entry_index]['start'] = new_start
-            self.entries[entry_index]['end'] = new_end
+        # new_start and new_end are milliseconds, stored as ints (see _as_ms)
+        if 0 <= entry_index < len(self.numbers):
+            new_start, new_end = self._as_ms(new_start), self._as_ms(new_end)
+            self.starts[entry_index] = new_start
+            self.ends[entry_index] = new_end
 
     def modify_text_line(self, entry_index, line_index, new_text, new_formatting=None):
-        if 0 <= entry_index < len(self.entries) and 0 <= line_index < len(self.entries[entry_index]['text_lines']):
-            self.entries[entry_index]['text_lines'][line_index]['text'] = new_text
+        if self._has_line(entry_index, line_index):
+            self.texts[entry_index][line_index] = new_text
             if new_formatting is not None:
-                self.entries[entry_index]['text_lines'][line_index]['formatting'] = new_formatting
+                self.formattings[entry_index][line_index] = new_formatting
 
     def modify_formatting(self, entry_index, line_index, new_formatting):
-        if 0 <= entry_index < len(self.entries) and 0 <= line_index < len(self.entries[entry_index]['text_lines']):
-            self.entries[entry_index]['text_lines'][line_index]['formatting'] = new_formatting
+        if self._has_line(entry_index, line_index):
+            self.formattings[entry_index][line_index] = new_formatting
+
+    def shift_all(self, delta_ms):
+        # Shift every start and end time by delta_ms in place, clamped at 0;
+        # computed in int64 and range-checked before anything is written back
+        delta_ms = self._as_ms(delta_ms)
+        shifted = []
+        for times in (self.starts, self.ends):
+            if times:
+                values = np.frombuffer(times, dtype=np.intc).astype(np.int64)
+                values += delta_ms
+                np.maximum(values, 0, out=values)
+                if values.max() > _MAX_MS:
+                    raise ValueError(f"Shifting by {delta_ms} ms overflows the timestamps")
+                shifted.append((times, values))
+        for times, values in shifted:
+            view = np.frombuffer(times, dtype=np.intc)
+            view[:] = values
+            # Release the buffer so the array can grow again
+            del view
 
     def get_timestamps(self, entry_index):
-        if 0 <= entry_index < len(self.entries):
-            return self.entries[entry_index]['start'], self.entries[entry_index]['end']
+        if 0 <= entry_index < len(self.numbers):
+            return self.starts[entry_index], self.ends[entry_index]
         return None
 
     def get_text(self, entry_index, line_index):
-        if (0 <= entry_index < len(self.entries) and 
-            0 <= line_index < len(self.entries[entry_index]['text_lines'])):
-            return self.entries[entry_index]['text_lines'][line_index]['text']
+        if self._has_line(entry_index, line_index):
+            return self.texts[entry_index][line_index]
         return None
 
     def get_formatting(self, entry_index, line_index):
-        if (0 <= entry_index < len(self.entries) and 
-            0 <= line_index < len(self.entries[entry_index]['text_lines'])):
-            return self.entries[entry_index]['text_lines'][line_index]['formatting']
+        if self._has_line(entry_index, line_index):
+            return self.formattings[entry_index][line_index]
         return None
 
     def save(self, file_path):
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for entry in self.entries:
-                f.write(f"{entry['number']}\n")
-                start_time = self.format_time(entry['start'])
-                end_time = self.format_time(entry['end'])
-                f.write(f"{start_time} --> {end_time}\n")
-                for line in entry['text_lines']:
-                    if line['formatting']:
-                        opening_tags = ''.join([self.build_opening_tag(tag) for tag in line['formatting']])
-                        closing_tags = ''.join([self.build_closing_tag(tag) for tag in reversed(line['formatting'])])
-                        formatted_text = opening_tags + line['text'] + closing_tags
+        # Output is joined in memory and written in chunks of entries
+        with open(file_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            parts = []
+            entries = zip(self.numbers, self._format_times(self.starts), self._format_times(self.ends),
+                          self.texts, self.formattings)
+            for index, (number, start_time, end_time, texts, formattings) in enumerate(entries, 1):
+                parts.append(f"{number}\n{start_time} --> {end_time}\n")
+                for text, formatting in zip(texts, formattings):
+                    if formatting:
+                        # Identical formatting repeats a lot, reuse its tag strings
+                        tag_keys = tuple((tag['name'], tuple(tag['attrs'].items())) for tag in formatting)
+                        try:
+                            opening_tags, closing_tags = _format_tags(tag_keys)
+                        except TypeError:
+                            opening_tags = ''.join([self.build_opening_tag(tag) for tag in formatting])
+                            closing_tags = ''.join([self.build_closing_tag(tag) for tag in reversed(formatting)])
+                        parts.append(opening_tags + text + closing_tags + '\n')
                     else:
-                        formatted_text = line['text']
-                    f.write(formatted_text + '\n')
-                f.write('\n')
+                        parts.append(text + '\n')
+                parts.append('\n')
+                
+                # Cap peak memory on very large files
+                if index % _SAVE_CHUNK_ENTRIES == 0:
+                    f.write(''.join(parts))
+                    parts.clear()
+            f.write(''.join(parts))
 
 def test_parser_methods():
     parser = SRTParser()
@@ -142,6 +278,28 @@ def test_parser_methods():
     if formatting is not None:
         print("Entry 0, Line 0 Formatting:", formatting)
 
+def test_shift_all():
+    parser = SRTParser()
+    parser.starts.extend([1, 1500, 3500])
+    parser.ends.extend([2, 1600, 3600])
+
+    # An overflowing shift is rejected and leaves the timestamps untouched
+    try:
+        parser.shift_all(2**31 - 10)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("shift_all accepted an overflowing delta")
+    assert list(parser.starts) == [1, 1500, 3500]
+    assert list(parser.ends) == [2, 1600, 3600]
+
+    # Negative shifts clamp at 0
+    parser.shift_all(-2000)
+    assert list(parser.starts) == [0, 0, 1500]
+    assert list(parser.ends) == [0, 0, 1600]
+    print("shift_all: all checks passed")
+
 if __name__ == '__main__':
+    test_shift_all()
     test_parser_methods()
 
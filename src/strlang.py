@@ -7,6 +7,267 @@
 # Backend #####################################################################
 
 import re
+import sys
+
+try:
+    import numba
+    import numpy as np
+except ImportError:
+    numba = None
+
+# Lowercase words made only of letters
+_WORD_RE = re.compile(r'\b[a-z]+\b')
+
+# Every byte except a-z, for deleting everything but lowercase ASCII letters
+_NON_LETTER_BYTES = bytes(b for b in range(256) if not 97 <= b <= 122)
+
+# Common English words, deduplicated and sorted
+_COMMON_WORD_LIST = (
+    "I", "a", "ability", "able", "about", "above", "abundant", "accept",
+    "accident", "accurate", "achieve", "achievement", "across", "act",
+    "action", "active", "actual", "adaptable", "add", "admit", "adorable",
+    "advantage", "adventure", "adventurous", "advise", "affect", "after",
+    "again", "against", "age", "aggressive", "ago", "agree", "agreement",
+    "air", "alert", "all", "allow", "almost", "along", "already", "also",
+    "although", "always", "amazing", "ambition", "ambitious", "among",
+    "amount", "amused", "analysis", "and", "anger", "announce", "another",
+    "answer", "any", "anything", "apartment", "apologize", "appear",
+    "appearance", "appointment", "appreciative", "approve", "argue", "arm",
+    "around", "arrange", "arrest", "arrival", "art", "as", "ask", "assistance",
+    "at", "atmosphere", "attend", "attraction", "authentic", "authority",
+    "avoid", "away", "back", "background", "bake", "balanced", "barrier", "be",
+    "bear", "because", "become", "before", "beg", "begin", "behave", "behind",
+    "believe", "beneficial", "benefit", "best", "better", "between", "big",
+    "board", "body", "book", "borrow", "both", "boy", "brave", "break",
+    "breathe", "brilliant", "bring", "budget", "build", "business", "but",
+    "by", "calculate", "call", "calm", "can", "car", "care", "carefree",
+    "carry", "case", "cause", "celebrate", "celebration", "center", "century",
+    "ceremony", "certain", "challenge", "change", "characteristic", "charge",
+    "charismatic", "cheerful", "child", "church", "circumstance", "city",
+    "claim", "class", "clear", "clever", "close", "collaborative", "colleague",
+    "college", "color", "combination", "come", "comfortable", "committed",
+    "common", "company", "compassionate", "competition", "competitive",
+    "complain", "complete", "concern", "conclusion", "condition", "confident",
+    "confirm", "connect", "conscientious", "consequence", "consider",
+    "considerate", "consistent", "construction", "constructive", "continue",
+    "contribute", "control", "convince", "cooperative", "cost", "could",
+    "country", "courageous", "course", "court", "cover", "creative",
+    "criticism", "criticize", "curiosity", "curious", "customer", "cut",
+    "dance", "dark", "day", "deal", "death", "decision", "decisive",
+    "dedicated", "delightful", "deliver", "department", "depend",
+    "description", "deserve", "design", "determination", "determine",
+    "determined", "develop", "device", "difference", "different", "difficulty",
+    "diligent", "diplomatic", "direct", "direction", "disagree", "disaster",
+    "disciplined", "discover", "discovery", "discussion", "do", "doctor",
+    "door", "doubt", "down", "draw", "drive", "during", "dynamic", "each",
+    "eager", "early", "easy", "education", "effect", "efficient", "effort",
+    "either", "election", "elegant", "eloquent", "employment", "encourage",
+    "end", "energetic", "energy", "enough", "entertain", "enthusiastic",
+    "entire", "environment", "equipment", "establish", "ethical", "evaluate",
+    "even", "ever", "every", "evidence", "examine", "example", "exceptional",
+    "exist", "expand", "expect", "experience", "experienced", "experiment",
+    "explain", "explore", "express", "expression", "expressive",
+    "extraordinary", "eye", "face", "fact", "failure", "fall", "familiarity",
+    "family", "far", "farm", "fascinating", "father", "fearless", "feature",
+    "feel", "few", "field", "fight", "figure", "find", "fire", "firm", "first",
+    "flexible", "focused", "follow", "foot", "for", "force", "forgive",
+    "forgiving", "form", "foundation", "free", "friend", "friendly",
+    "friendship", "from", "front", "full", "fun-loving", "function", "further",
+    "future", "general", "generation", "generous", "gentle", "get", "girl",
+    "give", "go", "goal", "god", "good", "govern", "graceful", "grateful",
+    "great", "ground", "group", "grow", "growth", "guidance", "half", "hand",
+    "handle", "happen", "hard", "hardworking", "have", "he", "head", "hear",
+    "help", "helpful", "here", "hesitate", "high", "history", "hold", "home",
+    "honest", "hope", "hospitality", "hour", "house", "how", "however",
+    "human", "humble", "idea", "identify", "if", "ignore", "imagination",
+    "imaginative", "imagine", "importance", "important", "impress",
+    "impression", "improve", "in", "include", "increase", "independence",
+    "independent", "industrious", "industry", "influence", "inform",
+    "ingenious", "initiative", "insightful", "insist", "inspiration",
+    "inspiring", "instruction", "intelligence", "intelligent", "intention",
+    "interaction", "interest", "into", "introduce", "intuitive", "inventive",
+    "invest", "investment", "invite", "it", "joke", "joyful", "judge", "just",
+    "keep", "kind", "kindhearted", "know", "knowledgeable", "land", "large",
+    "last", "late", "law", "lead", "leadership", "learn", "least", "leave",
+    "lend", "less", "let", "letter", "level", "lie", "life", "lifestyle",
+    "light", "like", "limit", "limitation", "line", "literature", "little",
+    "live", "lively", "local", "logical", "long", "look", "lose", "lovable",
+    "love", "low", "loyal", "maintain", "make", "man", "manage", "management",
+    "manufacture", "many", "market", "marketing", "material", "matter", "may",
+    "mean", "measure", "medication", "meet", "member", "mention", "meticulous",
+    "might", "mind", "minute", "modern", "moment", "money", "month", "more",
+    "morning", "most", "mother", "motivated", "motivation", "move", "much",
+    "music", "must", "name", "nation", "nature", "near", "necessary",
+    "necessity", "need", "negotiation", "never", "new", "next", "night", "no",
+    "not", "note", "nothing", "notice", "now", "number", "obligation",
+    "observant", "observe", "obtain", "of", "off", "offer", "office", "often",
+    "old", "on", "once", "one", "only", "open", "operation", "opportunity",
+    "optimistic", "or", "order", "organization", "organize", "organized",
+    "other", "out", "outgoing", "outside", "over", "own", "part",
+    "participant", "participation", "particular", "partnership", "party",
+    "pass", "passionate", "past", "patient", "pay", "peace", "people", "per",
+    "perception", "perceptive", "performance", "perhaps", "permission",
+    "permit", "persistent", "person", "persuade", "persuasive", "phenomenon",
+    "philosophy", "picture", "place", "plan", "plant", "play", "playful",
+    "point", "political", "population", "position", "positive", "possession",
+    "possibility", "possible", "postpone", "power", "practical", "predict",
+    "preparation", "prepare", "present", "presentation", "president",
+    "pressure", "pretend", "prevent", "priority", "proactive", "probable",
+    "problem", "procedure", "produce", "productive", "productivity",
+    "profession", "program", "progress", "promotion", "property", "proportion",
+    "prospect", "protect", "protection", "provide", "public", "purpose", "put",
+    "qualification", "question", "quite", "rate", "rather", "rational",
+    "reach", "read", "real", "realistic", "realize", "reason", "receive",
+    "recent", "recognition", "recommend", "recommendation", "record",
+    "recover", "reduce", "reflect", "refuse", "regard", "regret", "relax",
+    "reliable", "religion", "remain", "remember", "remind", "report",
+    "reputation", "requirement", "rescue", "resilient", "resource",
+    "resourceful", "respected", "responsibility", "responsible", "rest",
+    "result", "retire", "retirement", "return", "right", "rise", "road",
+    "room", "rule", "run", "same", "satisfaction", "satisfy", "say", "school",
+    "scream", "second", "see", "seem", "select", "self-assured",
+    "self-disciplined", "send", "sense", "sensible", "sensitivity", "separate",
+    "serve", "service", "set", "several", "shall", "she", "short", "should",
+    "shout", "show", "shrink", "side", "signal", "significance", "simple",
+    "since", "sincere", "sit", "situation", "small", "sneeze", "so",
+    "sociable", "social", "society", "solution", "solve", "some", "something",
+    "sound", "south", "speak", "special", "spirit", "stage", "stand", "start",
+    "state", "step", "still", "stop", "strategic", "strategy", "street",
+    "strong", "strong-willed", "structure", "struggle", "student", "study",
+    "subject", "succeed", "success", "such", "suggest", "suggestion",
+    "supervision", "support", "supportive", "sure", "surface", "surround",
+    "survival", "suspect", "system", "table", "take", "talk", "tax", "teach",
+    "technology", "tell", "tendency", "term", "test", "than", "that", "the",
+    "then", "there", "these", "they", "thing", "think", "this", "those",
+    "though", "thoughtful", "through", "thus", "time", "to", "today",
+    "together", "too", "top", "total", "toward", "town", "tradition", "train",
+    "transformation", "translate", "transportation", "treat", "true",
+    "trustworthy", "try", "turn", "type", "under", "understand",
+    "understanding", "unique", "unite", "university", "until", "up", "upon",
+    "use", "usual", "value", "variation", "venture", "versatile", "very",
+    "vibrant", "view", "violence", "voice", "wait", "walk", "wall", "want",
+    "war", "warmhearted", "watch", "water", "way", "we", "week", "welfare",
+    "well", "west", "what", "when", "where", "whether", "which", "while",
+    "whisper", "white", "who", "whole", "why", "wife", "will", "wise", "with",
+    "within", "without", "witty", "woman", "word", "work", "world", "worry",
+    "would", "write", "year", "yet", "you", "young",
+)
+
+# Set of the common words, built once at import time; interned so that
+# probes with interned tokens compare by identity first
+_COMMON_WORDS: frozenset = frozenset(map(sys.intern, _COMMON_WORD_LIST))
+
+# Character trie of the common words, built once at import time;
+# a node maps characters to child nodes, and _TRIE_END marks a complete word
+_TRIE_END = ''
+
+def _build_trie(words) -> dict:
+    root = {}
+    for word in words:
+        node = root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[_TRIE_END] = True
+    return root
+
+_COMMON_TRIE = _build_trie(_COMMON_WORDS)
+
+# Walk the trie along a prefix, returning the node reached or None
+def _trie_walk(prefix: str):
+    node = _COMMON_TRIE
+    for ch in prefix:
+        node = node.get(ch)
+        if node is None:
+            return None
+    return node
+
+def is_common_word(word: str) -> bool:
+    """
+    Check whether a word is one of the common English words used by is_english.
+
+    Args:
+        word: The word to look up (case-sensitive, use lowercase).
+
+    Returns:
+        True if the word is a common English word, otherwise False.
+    """
+    return word in _COMMON_WORDS
+
+def has_common_prefix(prefix: str) -> bool:
+    """
+    Check whether any common English word starts with the given prefix.
+
+    Useful for incremental matching, e.g. deciding while a word is still being
+    typed or streamed whether it can still become a common word.
+
+    Args:
+        prefix: The prefix to look up (case-sensitive, use lowercase).
+
+    Returns:
+        True if at least one common English word starts with the prefix, otherwise False.
+    """
+    return _trie_walk(prefix) is not None
+
+# JIT word counting over ASCII bytes, used when numba is available
+if numba is not None:
+    _FNV_OFFSET = np.uint64(0xcbf29ce484222325)
+    _FNV_PRIME = np.uint64(0x100000001b3)
+    
+    # 64-bit FNV-1a hash of a byte string
+    def _fnv1a(data: bytes) -> int:
+        h = 0xcbf29ce484222325
+        for b in data:
+            h = ((h ^ b) * 0x100000001b3) & 0xFFFFFFFFFFFFFFFF
+        return h
+    
+    # Open-addressing table of the hashes of every common word that the word
+    # pattern can match (only [a-z]); 0 marks an empty slot
+    def _build_hash_table(words) -> np.ndarray:
+        hashes = [_fnv1a(w.encode('ascii')) for w in words if w.isascii() and w.isalpha() and w.islower()]
+        size = 1 << (2 * len(hashes)).bit_length()
+        table = np.zeros(size, dtype=np.uint64)
+        for h in hashes:
+            slot = h & (size - 1)
+            while table[slot] != 0:
+                slot = (slot + 1) & (size - 1)
+            table[slot] = h
+        return table
+    
+    _HASH_TABLE = _build_hash_table(_COMMON_WORDS)
+    
+    # Count (common, total) words in lowercased ASCII bytes; a word is a maximal
+    # run of [a-z0-9_] made of letters only, exactly as \b[a-z]+\b matches
+    @numba.njit(cache=True)
+    def _count_words_ascii(data, table):
+        mask = np.uint64(table.shape[0] - 1)
+        common = 0
+        total = 0
+        h = _FNV_OFFSET
+        in_word = False
+        letters_only = True
+        for i in range(data.shape[0] + 1):
+            c = data[i] if i < data.shape[0] else 0
+            is_letter = 97 <= c <= 122
+            if is_letter or 48 <= c <= 57 or c == 95:
+                if not in_word:
+                    in_word = True
+                    letters_only = True
+                    h = _FNV_OFFSET
+                if is_letter:
+                    h = (h ^ np.uint64(c)) * _FNV_PRIME
+                else:
+                    letters_only = False
+            elif in_word:
+                in_word = False
+                if letters_only:
+                    total += 1
+                    slot = h & mask
+                    while table[slot] != 0:
+                        if table[slot] == h:
+                            common += 1
+                            break
+                        slot = (slot + np.uint64(1)) & mask
+        return common, total
 
 def is_english(text: str, threshold: float = 0.20) -> (float, bool):
     """
@@ -26,148 +287,28 @@ def is_english(text: str, threshold: float = 0.20) -> (float, bool):
         Ratio (Float),
         True if the ratio of common words meets or exceeds the threshold, otherwise False.
     """
-    # A set of common English words
-    common_words = {
- "the", "be", "of", "and", "a", "to", "in", "he", "have", "it",
-    "that", "for", "they", "I", "with", "as", "not", "on", "she", "at",
-    "by", "this", "we", "you", "do", "but", "from", "or", "which", "one",
-    "would", "all", "will", "there", "say", "who", "make", "when", "can",
-    "more", "if", "no", "man", "out", "other", "so", "what", "time",
-    "up", "go", "about", "than", "into", "could", "state", "only",
-    "new", "year", "some", "take", "come", "these", "know", "see",
-    "use", "get", "like", "then", "first", "any", "work", "now",
-    "may", "such", "give", "over", "think", "most", "even", "find",
-    "day", "also", "after", "way", "many", "must", "look", "before",
-    "great", "back", "through", "long", "where", "much", "should",
-    "well", "people", "down", "own", "just", "because", "good",
-    "each", "those", "feel", "seem", "how", "high", "too", "place",
-    "little", "world", "very", "still", "nation", "hand", "old",
-    "life", "tell", "write", "become", "here", "show", "house",
-    "both", "between", "need", "mean", "call", "develop", "under",
-    "last", "right", "move", "thing", "general", "school", "never",
-    "same", "another", "begin", "while", "number", "part", "turn",
-    "real", "leave", "might", "want", "point", "form", "off", "child",
-    "few", "small", "since", "against", "ask", "late", "home",
-    "interest", "large", "person", "end", "open", "public", "follow",
-    "during", "present", "without", "again", "hold", "govern",
-    "around", "possible", "head", "consider", "word", "program",
-    "problem", "however", "lead", "system", "set", "order", "eye",
-    "plan", "run", "keep", "face", "fact", "group", "play", "stand",
-    "increase", "early", "course", "change", "help", "line", "city",
-    "put", "close", "case", "force", "meet", "once", "water", "upon",
-    "war", "build", "hear", "light", "unite", "live", "every",
-    "country", "bring", "center", "let", "side", "try", "provide",
-    "continue", "name", "certain", "power", "pay", "result",
-    "question", "study", "woman", "member", "until", "far", "night",
-    "always", "service", "away", "report", "something", "company",
-    "week", "church", "toward", "start", "social", "room", "figure",
-    "nature", "though", "young", "less", "enough", "almost", "read",
-    "include", "president", "nothing", "yet", "better", "big", "boy",
-    "cost", "business", "value", "second", "why", "clear", "expect",
-    "family", "complete", "act", "sense", "mind", "experience",
-    "art", "next", "near", "direct", "car", "law", "industry",
-    "important", "girl", "god", "several", "matter", "usual",
-    "rather", "per", "often", "kind", "among", "white", "reason",
-    "action", "return", "foot", "care", "simple", "within", "love",
-    "human", "along", "appear", "doctor", "believe", "speak",
-    "active", "student", "month", "drive", "concern", "best",
-    "door", "hope", "example", "inform", "body", "ever", "least",
-    "probable", "understand", "reach", "effect", "different",
-    "idea", "whole", "control", "condition", "field", "pass",
-    "fall", "note", "special", "talk", "particular", "today",
-    "measure", "walk", "teach", "low", "hour", "type", "carry",
-    "rate", "remain", "full", "street", "easy", "although",
-    "record", "sit", "determine", "level", "local", "sure",
-    "receive", "thus", "moment", "spirit", "train", "college",
-    "religion", "perhaps", "music", "grow", "free", "cause",
-    "serve", "age", "book", "board", "recent", "sound", "office",
-    "cut", "step", "class", "true", "history", "position",
-    "above", "strong", "friend", "necessary", "add", "court",
-    "deal", "tax", "support", "party", "whether", "either",
-    "land", "material", "happen", "education", "death",
-    "agree", "arm", "mother", "across", "quite", "anything",
-    "town", "past", "view", "society", "manage", "answer",
-    "break", "organize", "half", "fire", "lose", "money",
-    "stop", "actual", "already", "effort", "wait",
-    "department", "able", "political", "learn", "voice",
-    "air", "together", "shall", "cover", "common", "subject",
-    "draw", "short", "wife", "treat", "limit", "road",
-    "letter", "color", "behind", "produce", "send", "term",
-    "total", "university", "rise", "century", "success",
-    "minute", "remember", "purpose", "test", "fight",
-    "watch", "situation", "south", "ago", "difference",
-    "stage", "father", "table", "rest", "bear", "entire",
-    "market", "prepare", "explain", "offer", "plant",
-    "charge", "ground", "west", "picture", "hard", "front",
-    "lie", "modern", "dark", "surface", "rule", "regard",
-    "dance", "peace", "observe", "future", "wall", "farm",
-    "claim", "firm", "operation", "further", "pressure",
-    "property", "morning", "amount", "top", "outside",
-    "accept", "achieve", "admit", "advise", "affect", "allow", "announce",
-    "apologize", "approve", "argue", "arrange", "arrest", "attend", "avoid", "bake", "beg", "behave", 
-    "borrow", "breathe", "calculate", "celebrate", "complain", "confirm", "connect", 
-    "contribute", "convince", "criticize", "deliver", "depend", "design", "deserve", 
-    "develop", "disagree", "discover", "doubt", "encourage", "entertain", "establish", 
-    "evaluate", "examine", "exist", "expand", "expect", "explain", "explore", "express", 
-    "forgive", "handle", "hesitate", "identify", "ignore", "imagine", "impress", "improve", 
-    "insist", "introduce", "invest", "invite", "joke", "judge", "lend", "maintain", "manufacture", 
-    "measure", "mention", "notice", "observe", "obtain", "organize", "permit", "persuade", 
-    "postpone", "predict", "pretend", "prevent", "protect", "realize", "recommend", 
-    "recover", "reduce", "reflect", "refuse", "regret", "relax", "remind", "rescue", 
-    "retire", "satisfy", "scream", "select", "separate", "shout", "shrink", "signal", 
-    "sneeze", "solve", "struggle", "succeed", "suggest", "support", "surround", "suspect", 
-    "translate", "whisper", "worry", 
-    "ability", "accident", "achievement", "advantage", "adventure", "agreement", 
-    "ambition", "analysis", "anger", "apartment", "appearance", "appointment", 
-    "arrival", "assistance", "atmosphere", "attraction", "authority", "background", 
-    "barrier", "benefit", "budget", "celebration", "ceremony", "challenge", "characteristic", 
-    "circumstance", "colleague", "combination", "competition", "conclusion", "condition", 
-    "consequence", "construction", "criticism", "curiosity", "customer", "decision", 
-    "description", "determination", "device", "difficulty", "direction", "disaster", 
-    "discovery", "discussion", "education", "election", "employment", "energy", 
-    "environment", "equipment", "evidence", "experience", "experiment", "expression", 
-    "failure", "familiarity", "feature", "foundation", "friendship", "function", 
-    "generation", "goal", "growth", "guidance", "hospitality", "imagination", "importance", 
-    "impression", "independence", "influence", "initiative", "inspiration", "instruction", 
-    "intelligence", "intention", "interaction", "investment", "leadership", "lifestyle", 
-    "limitation", "literature", "management", "marketing", "medication", "motivation", 
-    "necessity", "negotiation", "obligation", "opportunity", "organization", "participant", 
-    "participation", "partnership", "perception", "performance", "permission", "phenomenon", 
-    "philosophy", "population", "possession", "possibility", "preparation", "presentation", 
-    "priority", "procedure", "productivity", "profession", "progress", "promotion", 
-    "property", "proportion", "prospect", "protection", "qualification", "recognition", 
-    "recommendation", "reputation", "requirement", "resource", "responsibility", "retirement", 
-    "satisfaction", "sensitivity", "significance", "solution", "strategy", "structure", 
-    "suggestion", "supervision", "survival", "technology", "tendency", "tradition", 
-    "transformation", "transportation", "variation", "venture", "violence", "welfare",
-    "abundant", "accurate", "active", "adaptable", "adorable", "adventurous", 
-    "aggressive", "alert", "amazing", "ambitious", "amused", "appreciative", 
-    "authentic", "balanced", "beneficial", "brave", "brilliant", "calm", "carefree", 
-    "charismatic", "cheerful", "clever", "collaborative", "comfortable", "committed", 
-    "compassionate", "competitive", "confident", "conscientious", "considerate", 
-    "consistent", "constructive", "cooperative", "courageous", "creative", "curious", 
-    "decisive", "dedicated", "delightful", "determined", "diligent", "diplomatic", 
-    "disciplined", "dynamic", "eager", "efficient", "elegant", "eloquent", "energetic", 
-    "enthusiastic", "ethical", "exceptional", "experienced", "expressive", "extraordinary", 
-    "fascinating", "fearless", "flexible", "focused", "forgiving", "friendly", "fun-loving", 
-    "generous", "gentle", "graceful", "grateful", "hardworking", "helpful", "honest", 
-    "humble", "imaginative", "independent", "industrious", "ingenious", "insightful", 
-    "inspiring", "intelligent", "intuitive", "inventive", "joyful", "kindhearted", 
-    "knowledgeable", "lively", "logical", "lovable", "loyal", "meticulous", "motivated", 
-    "observant", "optimistic", "organized", "outgoing", "passionate", "patient", 
-    "perceptive", "persistent", "persuasive", "playful", "positive", "practical", 
-    "proactive", "productive", "rational", "realistic", "reliable", "resilient", 
-    "resourceful", "respected", "responsible", "self-assured", "self-disciplined", 
-    "sensible", "sincere", "sociable", "strategic", "strong-willed", "supportive", 
-    "thoughtful", "trustworthy", "understanding", "unique", "versatile", "vibrant", 
-    "warmhearted", "witty", "wise"
-    }
+    # Count over raw bytes with the JIT kernel; non-ASCII text keeps the regex
+    # path since Unicode word boundaries do not map onto bytes
+    if numba is not None and text.isascii():
+        data = np.frombuffer(text.lower().encode('ascii'), dtype=np.uint8)
+        common_count, total = _count_words_ascii(data, _HASH_TABLE)
+        if not total:
+            return 0.0, False
+        ratio = common_count / total
+        return ratio, ratio >= threshold
+    
+    # Text without a single ASCII letter (e.g. pure CJK) has no words at all;
+    # detect that in C before running the tokenizer over it
+    text = text.lower()
+    if not text.encode('ascii', 'ignore').translate(None, _NON_LETTER_BYTES):
+        return 0.0, False
     
     # Extract words composed only of letters and convert them to lowercase
-    words = re.findall(r'\b[a-z]+\b', text.lower())
+    words = _WORD_RE.findall(text)
     if not words:
         return 0.0, False
-    common_count = sum(1 for word in words if word in common_words)
+    # Count in C rather than per word in a generator (multiplicity matters)
+    common_count = sum(map(_COMMON_WORDS.__contains__, words))
     ratio = common_count / len(words)
     return ratio, ratio >= threshold
 
@@ -8,6 +8,26 @@
 
 import re
 
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Markdown patterns used by str_demarkdown, applied one after another in this order;
+# each pass sees the output of the previous one, so they are not fused into one scan.
+# Emphasis is spelled out per marker instead of a backreference, so that the
+# same patterns also compile under RE2 (linear time on adversarial input)
+_MD_PASSES = (
+    (r'(?s)```.*?```', ''),                                   # code blocks
+    (r'`([^`]+?)`', None),                                    # inline code
+    (r'\*\*(.*?)\*\*|\*(.*?)\*|__(.*?)__|_(.*?)_', None),     # bold and italic
+    (r'\[([^\]]+)\]\([^)]+\)', None),                         # links
+    (r'(?m)^#{1,6}\s*', ''),                                  # headers
+    (r'(?m)^>\s+', ''),                                       # blockquotes
+    (r'(?m)^[\*\-\+]\s+', ''),                                # list markers
+)
+_MD_RES = tuple(((re2 or re).compile(pattern), repl) for pattern, repl in _MD_PASSES)
+
 # String unquote
 def str_unquote(s: str) -> str:
     '''
@@ -24,10 +44,16 @@ def str_unquote(s: str) -> str:
         A clear string that does not contains " or ' at the beginning or end
 
     '''
-    if (s.startswith('"') and s.endswith('"')) or (s.startswith("'") and s.endswith("'")):
+    # One look at each end instead of four startswith/endswith calls;
+    # like before, a lone quote character unquotes to ''
+    if s and s[0] == s[-1] and (s[0] == '"' or s[0] == "'"):
         return s[1:-1]
     return s
 
+# Replacement keeping the inner text of whichever group matched
+def _md_inner(m) -> str:
+    return ''.join(g for g in m.groups() if g)
+
 def str_demarkdown(text):
     """
     Remove common markdown formatting symbols from a string.
@@ -47,32 +73,31 @@ def str_demarkdown(text):
     str
         A cleaned string with markdown formatting removed.
     """
-    # Remove code blocks that are wrapped in triple backticks, including any content within.
-    text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
-    
-    # Remove inline code that is wrapped in single backticks.
-    text = re.sub(r'`([^`]+?)`', r'\1', text)
-    
-    # Remove markdown emphasis markers for bold and italic (e.g., **text**, *text*, __text__, _text_).
-    text = re.sub(r'(\*\*|\*|__|_)(.*?)\1', r'\2', text)
-    
-    # Replace markdown links [text](url) with just the text portion.
-    text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
+    # Remove code blocks, inline code, emphasis, links, headers, blockquotes
+    # and list markers, one pass each.
+    for pattern, repl in _MD_RES:
+        text = pattern.sub(_md_inner if repl is None else repl, text)
     
-    # Remove markdown headers by eliminating leading '#' characters (from one to six) and any following spaces.
-    text = re.sub(r'^#{1,6}\s*', '', text, flags=re.MULTILINE)
+    # Replace hyphens with a space to avoid merging words unintentionally
+    # (the surrounding whitespace is collapsed below anyway).
+    text = text.replace('-', ' ')
     
-    # Remove blockquotes by deleting the leading '>' and any following spaces at the beginning of lines.
-    text = re.sub(r'^>\s+', '', text, flags=re.MULTILINE)
-    
-    # Remove list markers (such as '-', '*', '+') from the start of lines.
-    text = re.sub(r'^[\*\-\+]\s+', '', text, flags=re.MULTILINE)
-    
-    # Replace hyphens used as separators with a space to avoid merging words unintentionally.
-    text = re.sub(r'\s*-\s*', ' ', text)
-    
-    # Replace multiple whitespace characters (including newlines) with a single space.
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Return the cleaned text after stripping leading/trailing whitespace.
-    return text.strip()
+    # Collapse whitespace runs (including newlines) into single spaces; split()
+    # also drops leading/trailing whitespace.
+    return ' '.join(text.split())
+
+# Test
+if __name__ == "__main__":
+    # Output of the former one-regex-per-element passes on link, emphasis and quote mixes
+    cases = {
+        'Edit config_file per [the_guide](https://example.com/guide)': 'Edit configfile per theguide',
+        '> > nested quote': '> nested quote',
+        '# > - heading quote list': 'heading quote list',
+        '**bold** and *it* and __u__ and _i_': 'bold and it and u and i',
+        'see [**docs**](http://x.com/a_b) now': 'see docs now',
+        '`code_span` then ```block\ncode``` end': 'code_span then end',
+        '* item - one\n+ item two': 'item one item two',
+    }
+    for src, expected in cases.items():
+        assert str_demarkdown(src) == expected, (src, str_demarkdown(src))
+    print("str_demarkdown: all cases passed")
@@ -6,11 +6,27 @@
 
 # Backend #####################################################################
 
-import concurrent.futures
-import uuid
+import itertools
+import queue
 import threading
 import time
-from typing import Any
+from concurrent.futures import CancelledError
+from typing import Any, Callable, Iterable, List
+
+class _Task:
+    """
+    One submitted call and its outcome; `done` is set once it finished or was cancelled.
+    """
+    __slots__ = ("task_id", "func", "args", "kwargs", "done", "result", "error")
+
+    def __init__(self, task_id: int, func, args, kwargs):
+        self.task_id = task_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
 
 class ThreadPool:
     """
@@ -22,14 +38,42 @@ class ThreadPool:
         Initialize the thread pool.
         
         Parameters:
-            max_workers (int): Maximum number of worker threads (default: system default).
+            max_workers (int): Maximum number of worker threads (default: 4).
         """
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
-        self.tasks = {}  # Mapping from task id to Future
-        self.lock = threading.Lock()
+        self.max_workers = max_workers
+        self.tasks = {}  # Mapping from task id to task
+        self.lock = threading.Lock()  # Guards submission against stopall and shutdown
+        self._id_counter = itertools.count()  # Task ids, never reused within a pool
+        self._shutdown = False  # Set by shutdown; no tasks are accepted afterwards
+
+        # Tasks not started yet; a worker or stopall claims a task by popping it,
+        # so exactly one of them gets to run or cancel it
+        self._pending = {}
+
+        # Persistent daemon workers fed through a lock-free queue
+        self._queue = queue.SimpleQueue()
+        self._workers = [threading.Thread(target=self._worker, daemon=True) for _ in range(max_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    # Worker loop: run queued tasks until the shutdown sentinel arrives
+    def _worker(self):
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+            if self._pending.pop(task.task_id, None) is None:
+                continue  # Cancelled by stopall
+            try:
+                task.result = task.func(*task.args, **task.kwargs)
+            except BaseException as e:
+                task.error = e
+            finally:
+                task.func = task.args = task.kwargs = None
+                task.done.set()
 
     # Execute something with an assigned task number returned
-    def execute(self, func, *args, **kwargs) -> Any:
+    def execute(self, func, *args, **kwargs) -> int:
         """
         Submit a function to be executed in a separate thread.
         
@@ -39,14 +83,56 @@ class ThreadPool:
             **kwargs: Keyword arguments for the function.
             
         Returns:
-            str: A unique task id representing the submitted task.
+            int: A unique task id representing the submitted task.
+            
+        Raises:
+            RuntimeError: If the pool has been shut down.
         """
-        task_id = str(uuid.uuid4())
-        future = self.executor.submit(func, *args, **kwargs)
         with self.lock:
-            self.tasks[task_id] = future
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new tasks after shutdown")
+            task_id = next(self._id_counter)
+            task = _Task(task_id, func, args, kwargs)
+            self.tasks[task_id] = task
+            self._pending[task_id] = task
+            self._queue.put(task)
         return task_id
 
+    # Execute a function over many items, submitted in chunks
+    def map_batch(self, func: Callable, iterable: Iterable, chunksize: int = None) -> List[Any]:
+        """
+        Apply a function to every item, dispatching the items to the workers in chunks
+        so that the per-task overhead is paid once per chunk rather than once per item.
+        
+        Parameters:
+            func (callable): The function to apply to each item.
+            iterable: The items.
+            chunksize (int): Items per task (default: spread evenly, about 4 chunks per worker).
+            
+        Returns:
+            list: The results, in the order of the items.
+            
+        Raises:
+            RuntimeError: If the pool has been shut down.
+        """
+        if self._shutdown:
+            raise RuntimeError("cannot schedule new tasks after shutdown")
+        items = list(iterable)
+        if not items:
+            return []
+        if chunksize is None:
+            chunksize = max(1, -(-len(items) // (4 * self.max_workers)))
+
+        def run_chunk(chunk):
+            return [func(item) for item in chunk]
+
+        task_ids = [self.execute(run_chunk, items[i:i + chunksize]) for i in range(0, len(items), chunksize)]
+        results = []
+        for task_id in task_ids:
+            results.extend(self.waituntil(task_id))
+            self.tasks.pop(task_id, None)
+        return results
+
     # Coresively stop all tasks
     def stopall(self):
         """
@@ -54,30 +140,38 @@ class ThreadPool:
         Note that tasks already running may not be cancelled.
         Clears the internal task registry.
         """
+        # Swap in fresh registries, then cancel the old tasks outside the lock
         with self.lock:
-            for task_id, future in list(self.tasks.items()):
-                future.cancel()
-            self.tasks.clear()
-            
+            pending, self._pending = self._pending, {}
+            self.tasks = {}
+        for task_id in list(pending):
+            task = pending.pop(task_id, None)
+            if task is not None:
+                task.error = CancelledError()
+                task.func = task.args = task.kwargs = None
+                task.done.set()
+
     # Wait for a certain task
     def waituntil(self, task_id: Any):
         """
         Block until the task corresponding to the given id has finished.
         
         Parameters:
-            task_id (str): The unique id of the task.
-        
+            task_id (int): The unique id of the task.
+            
         Returns:
             The result of the task, if it completed successfully.
-        
+            
         Raises:
             ValueError: If the task id is not found.
         """
-        with self.lock:
-            future = self.tasks.get(task_id)
-        if future is None:
+        task = self.tasks.get(task_id)
+        if task is None:
             raise ValueError(f"Task with id {task_id} not found.")
-        return future.result()  # Blocks until the task completes
+        task.done.wait()  # Blocks until the task completes
+        if task.error is not None:
+            raise task.error
+        return task.result
     
     # Normally shut down
     def shutdown(self, wait=True):
@@ -87,7 +181,14 @@ class ThreadPool:
         Parameters:
             wait (bool): If True, block until all running tasks are finished.
         """
-        self.executor.shutdown(wait=wait)
+        # Sentinels queue up behind the submitted tasks, so those still run first
+        with self.lock:
+            self._shutdown = True
+            for _ in self._workers:
+                self._queue.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
 
 # Test cases demonstrating usage:
 if __name__ == '__main__':
@@ -7,6 +7,7 @@
 # Backend #####################################################################
 
 import pandas as pd
+from itertools import chain
 
 # Convert a pandas object to markdown format
 def pandas_to_markdown(df: pd.DataFrame, index=False):
@@ -14,16 +15,20 @@ def pandas_to_markdown(df: pd.DataFrame, index=False):
     columns = df.columns
     if index:
         columns = [''] + list(columns)
-        data = [[i] + list(row) for i, row in df.iterrows()]
-    else:
-        data = [list(row) for _, row in df.iterrows()]
     
     # Build headers and separators
     header = "| " + " | ".join(map(str, columns)) + " |"
     separator = "| " + " | ".join(["---"] * len(columns)) + " |"
     
-    # Generate data rows
-    rows = ["| " + " | ".join(map(str, row)) + " |" for row in data]
+    # Generate data rows from the raw values, without boxing each row into a Series
+    values = df.to_numpy()
+    if values.dtype.kind in 'mM':
+        # Box datetimes/timedeltas into pandas scalars, as iterrows did
+        values = df.astype(object).to_numpy()
+    if index:
+        rows = ["| " + str(i) + " | " + " | ".join(map(str, row)) + " |" for i, row in zip(df.index, values)]
+    else:
+        rows = ["| " + " | ".join(map(str, row)) + " |" for row in values]
     
     # Merge into a complete table
-    return "\n".join([header, separator] + rows)
+    return "\n".join(chain((header, separator), rows))
@@ -8,14 +8,44 @@
 # Discrete distribution: pass a dictionary or list of [(value, weight), ...];
 # Discretized continuous distribution: pass a pair (points, densities), representing the support points and corresponding unnormalized densities respectively.
 
+import random
 import numpy as np
-from typing import Callable, List, Union, Dict, Any
+from typing import Callable, List, Union, Dict, Any, Optional
 import logging
 
+try:
+    import numba
+    from numba.extending import is_jitted
+except ImportError:
+    numba = None
+
 # Logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Below this many draws, random.choices beats numpy's per-call dispatch overhead
+_SMALL_DRAW = 8
+
+
+# Metropolis loop compiled with numba, used when the target density is itself a numba-jitted function
+if numba is not None:
+    @numba.njit
+    def _metropolis_jit(target, x_init, noise, uniforms, burn_in, thinning, out):
+        x_current = x_init
+        p_current = target(x_current)
+        idx = 0
+        for i in range(noise.shape[0]):
+            x_candidate = x_current + noise[i]
+            p_candidate = target(x_candidate)
+            acceptance_ratio = 1.0 if p_current == 0 else p_candidate / p_current
+            if uniforms[i] < min(1.0, acceptance_ratio):
+                x_current = x_candidate
+                p_current = p_candidate
+            if i >= burn_in and (i - burn_in) % thinning == 0:
+                out[idx] = x_current
+                idx += 1
+        return out
+
 
 class DSampler:
     """
@@ -32,7 +62,7 @@ class DSampler:
         Dict[Any, float],
         List[Any],
         tuple
-    ]):
+    ], seed: Optional[int] = None):
         """
         Initialize the sampler.
         
@@ -44,8 +74,12 @@ class DSampler:
         * If each element in the list is a (value, weight) pair, it is a discrete distribution;
         * If the list length is 2 and they are points and densities respectively, it is a discretized continuous distribution;
         - If it is a tuple and the length is 2, it is regarded as a discretized continuous distribution of (points, densities).
+        seed: optional seed for reproducible sampling (default None, seeded from the OS).
         """
         self.target = target
+        # Per-sampler generators: PCG64 for array draws, and a seeded random.Random for small draws
+        self._rng = np.random.default_rng(seed)
+        self._py_rng = random.Random(seed)
         if callable(target):
             self.mode = "continuous"
             logger.info("Initialized in continuous mode.")
@@ -89,11 +123,43 @@ class DSampler:
         if total <= 0:
             raise ValueError("Sum of probabilities must be positive.")
         probs = probs / total
-        self.discrete_values = values
+        self.discrete_values = self._as_value_array(values)
         self.discrete_probs = probs
-        self.cumulative_probs = np.cumsum(probs)
+        self.cumulative_probs = self._cumulative(probs)
+        self._prepare_small_draws()
         logger.debug(f"Discrete cumulative probabilities: {self.cumulative_probs}")
 
+    @staticmethod
+    def _as_value_array(values: List[Any]) -> np.ndarray:
+        """
+        Convert the discrete values to an array once, so that sampling is a single fancy-indexing.
+        Values numpy cannot stack (e.g. tuples of different lengths) are kept in an object array.
+        """
+        try:
+            return np.asarray(values)
+        except ValueError:
+            array = np.empty(len(values), dtype=object)
+            for i, value in enumerate(values):
+                array[i] = value
+            return array
+
+    @staticmethod
+    def _cumulative(probs: np.ndarray) -> np.ndarray:
+        """
+        Cumulative distribution for sampling; the last entry is pinned to 1.0 so that
+        rounding in the sum can never send a uniform draw past the last index.
+        """
+        cumulative = np.cumsum(probs)
+        cumulative[-1] = 1.0
+        return cumulative
+
+    def _prepare_small_draws(self):
+        """
+        Keep plain-list copies of the values and cumulative weights for random.choices.
+        """
+        self._values_list = self.discrete_values.tolist()
+        self._cum_weights_list = self.cumulative_probs.tolist()
+
     def _prepare_discretized(self):
         """
         Preprocess the discretized continuous distribution:
@@ -111,7 +177,8 @@ class DSampler:
         probs = densities / total
         self.discrete_values = points
         self.discrete_probs = probs
-        self.cumulative_probs = np.cumsum(probs)
+        self.cumulative_probs = self._cumulative(probs)
+        self._prepare_small_draws()
         logger.debug(f"Discretized cumulative probabilities: {self.cumulative_probs}")
 
     def sample(self, num_samples: int = 1000, **kwargs) -> np.ndarray:
@@ -155,31 +222,50 @@ class DSampler:
         Returns:
         np.ndarray, containing the sampling result.
         """
-        samples = []
         x_current = init
         total_iterations = num_samples * thinning + burn_in
         logger.info(f"Starting continuous sampling: total_iterations={total_iterations}, "
                     f"init={init}, proposal_std={proposal_std}")
 
+        # Draw every proposal step and acceptance uniform up front
+        noise = self._rng.normal(0, proposal_std, total_iterations)
+        uniforms = self._rng.random(total_iterations)
+
+        # Samples are written into one preallocated array
+        out = np.empty(num_samples)
+
+        # A numba-jitted target runs the whole chain in compiled code
+        if numba is not None and is_jitted(self.target):
+            return _metropolis_jit(self.target, float(init), noise, uniforms, burn_in, thinning, out)
+
+        # Progress is logged every 10% only when debug logging is on
+        debug_on = logger.isEnabledFor(logging.DEBUG)
+        log_interval = max(total_iterations // 10, 1)
+
+        # The current density is carried across iterations, so each step costs one target call
+        p_current = self.target(x_current)
+
+        idx = 0
         for i in range(total_iterations):
             # 生成候选值（对称正态候选分布）
-            x_candidate = x_current + np.random.normal(0, proposal_std)
+            x_candidate = x_current + noise[i]
 
             # 计算接受率
-            p_current = self.target(x_current)
             p_candidate = self.target(x_candidate)
             acceptance_ratio = 1.0 if p_current == 0 else p_candidate / p_current
 
-            if np.random.rand() < min(1, acceptance_ratio):
+            if uniforms[i] < min(1, acceptance_ratio):
                 x_current = x_candidate
+                p_current = p_candidate
 
             if i >= burn_in and ((i - burn_in) % thinning == 0):
-                samples.append(x_current)
+                out[idx] = x_current
+                idx += 1
 
-            if (i + 1) % (total_iterations // 10) == 0:
+            if debug_on and (i + 1) % log_interval == 0:
                 logger.debug(f"Iteration {i+1}/{total_iterations}: current state = {x_current}")
 
-        return np.array(samples)
+        return out
 
     def _sample_discrete(self, num_samples: int) -> np.ndarray:
         """
@@ -191,10 +277,14 @@ class DSampler:
         Returns:
         np.ndarray containing the sampled results.
         """
-        random_values = np.random.rand(num_samples)
+        # Small draws skip numpy; object arrays (ragged values) stay on the indexing path
+        if 0 < num_samples < _SMALL_DRAW and self.discrete_values.dtype != object:
+            samples = self._py_rng.choices(self._values_list, cum_weights=self._cum_weights_list, k=num_samples)
+            return np.asarray(samples, dtype=self.discrete_values.dtype)
+
+        random_values = self._rng.random(num_samples)
         indices = np.searchsorted(self.cumulative_probs, random_values)
-        samples = np.array([self.discrete_values[i] for i in indices])
-        return samples
+        return self.discrete_values[indices]
 
     def fit(self, data: np.ndarray) -> Dict[str, Any]:
         """
@@ -224,6 +314,11 @@ if __name__ == "__main__":
         comp2 = 0.7 * np.exp(- (x + 2) ** 2 / (2 * 1.0))
         return comp1 + comp2
 
+    # With numba installed the density is jitted (it still accepts whole arrays for plotting),
+    # so DSampler runs the entire Metropolis chain as compiled code
+    if numba is not None:
+        mixture_density = numba.njit(mixture_density)
+
     sampler_cont = DSampler(mixture_density)
     samples_cont = sampler_cont.sample(
         num_samples=5000,
@@ -262,7 +357,7 @@ if __name__ == "__main__":
     # 例如：对混合高斯分布在一组离散点上评估密度
     points = np.linspace(-10, 10, 200)
     densities = mixture_density(points)  # 非归一化密度
-    sampler_disc_cont = Sampler((points, densities))
+    sampler_disc_cont = DSampler((points, densities))
     samples_disc_cont = sampler_disc_cont.sample(num_samples=5000)
     plt.figure(figsize=(8, 5))
     plt.hist(samples_disc_cont, bins=50, density=True, alpha=0.6, label="Discretized Samples")
@@ -7,16 +7,43 @@
 # Backend #####################################################################
 
 import os
+import re
 import json
 import csv
-import chardet
-import pandas as pd
-from typing import Optional, Dict, List, Any
-from docx import Document # pip install python-docx
+import codecs
+from typing import Optional, Dict, List, Any, Iterable
 from abc import ABC, abstractmethod
-import pdfplumber # pip install pdfplumber
 from urllib.parse import urlparse, unquote
 
+try:
+    import orjson # pip install orjson, optional C-implemented JSON codec
+except ImportError:
+    orjson = None
+
+try:
+    import pymupdf # pip install pymupdf, optional C-implemented PDF text extraction
+except ImportError:
+    try:
+        import fitz as pymupdf # older PyMuPDF releases
+    except ImportError:
+        pymupdf = None
+
+# Digit runs that may be integers beyond 64 bits, which orjson would silently turn into floats
+_LONG_DIGITS_RE = re.compile(rb'\d{19,}')
+
+# Heavy third-party readers (chardet, pandas, python-docx, pdfplumber) are imported
+# inside the readers that need them, so opening a .txt file never loads them
+
+# WordprocessingML tags read directly off the paragraph xml
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_R, _W_RPR, _W_VAL = _W_NS + 'r', _W_NS + 'rPr', _W_NS + 'val'
+_W_B, _W_I, _W_U = _W_NS + 'b', _W_NS + 'i', _W_NS + 'u'
+_W_OFF = frozenset(('0', 'false', 'off'))
+
+# URL schemes is_file reports as urls; file: is resolved, any other scheme is taken as a local path
+_URL_SCHEMES = frozenset(('http', 'https', 'ftp', 'udp'))
+_IS_NT = os.name == 'nt'
+
 # if you want to test, import this
 from mkdown_renderer import go_renderer
 
@@ -93,20 +120,27 @@ class Base_FileVisitor(ABC):
         pass
 
     @staticmethod
-    def _to_markdown_table(data: list) -> str:
+    def _to_markdown_table(data: Iterable[list]) -> str:
         """
         Convert a two-dimensional array to a Markdown table
         Suitable for csv or excel tables
+        Rows may also be a lazy iterable (e.g. a csv.reader), consumed in one pass
         """
-        if not data:
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None:
             return ""
         
-        header = "| " + " | ".join(data[0]) + " |"
-        separator = "| " + " | ".join(["---"] * len(data[0])) + " |"
-        body = "\n".join(
-            ["| " + " | ".join(map(str, row)) + " |" for row in data[1:]]
-        )
-        return "\n".join([header, separator, body])
+        # Pieces of the whole table, joined once at the end
+        parts = ["| ", " | ".join(first), " |\n| ", " | ".join(["---"] * len(first)), " |\n"]
+        append = parts.append
+        sep = "| "
+        for row in rows:
+            append(sep)
+            append(" | ".join(map(str, row)))
+            append(" |")
+            sep = "\n| "
+        return "".join(parts)
 
 # Deriv class: txt, plain text
 class Deriv_TextFileReader(Base_FileVisitor):
@@ -127,12 +161,36 @@ class Deriv_TextFileReader(Base_FileVisitor):
     def _detect_encoding(self) -> str:
         """
         Automatically detect file encoding
+        BOMs and valid UTF-8 (including plain ASCII) are recognized directly,
+        chardet is only consulted for anything else
         """
         try:
             with open(self.file_path, "rb") as f:
                 raw = f.read(4000)
-                result = chardet.detect(raw)
-                return result["encoding"] or "utf-8"
+        except Exception as e:
+            return "utf-8"
+        
+        # Byte order marks
+        if raw.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+        if raw.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
+            return "utf-32"
+        if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return "utf-16"
+        
+        # UTF-8, allowing a multi-byte character cut off by the sample boundary
+        try:
+            raw.decode("utf-8")
+            return "utf-8"
+        except UnicodeDecodeError as e:
+            if len(raw) == 4000 and e.reason == "unexpected end of data":
+                return "utf-8"
+        
+        # Genuinely ambiguous content
+        try:
+            import chardet # pip install chardet
+            result = chardet.detect(raw)
+            return result["encoding"] or "utf-8"
         except Exception as e:
             return "utf-8"
 
@@ -150,15 +208,16 @@ class Deriv_CsvFileReader(Base_FileVisitor):
     """
     
     def read(self, as_markdown: bool = False) -> str:
+        # Rows are streamed from the reader straight into the output text
         try:
             with open(self.file_path, "r", encoding="utf-8") as f:
                 reader = csv.reader(f)
-                data = list(reader)
+                if as_markdown:
+                    return self._to_markdown_table(reader)
+                return "\n".join(map(",".join, reader))
         except Exception as e:
             raise FileReadError(f"Failed to read a csv file: {str(e)}")
 
-        return self._to_markdown_table(data) if as_markdown else "\n".join([",".join(row) for row in data])
-
 # Deriv class: json file
 class Deriv_JsonFileReader(Base_FileVisitor):
     """
@@ -167,14 +226,27 @@ class Deriv_JsonFileReader(Base_FileVisitor):
     
     def read(self, as_markdown: bool = False) -> str:
         try:
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                content = json.load(f)
-                formatted = json.dumps(content, indent=2, ensure_ascii=False)
+            with open(self.file_path, "rb") as f:
+                formatted = self._format_json(f.read())
         except Exception as e:
             raise FileReadError(f"Failed to read a json file: {str(e)}")
 
         return f"```json\n{formatted}\n```" if as_markdown else formatted
 
+    @staticmethod
+    def _format_json(raw: bytes) -> str:
+        """
+        Parse and pretty-print JSON bytes with orjson when available
+        Input orjson rejects or would alter (NaN, integers beyond 64 bits, lone surrogates) falls back to json
+        """
+        if orjson is not None and not _LONG_DIGITS_RE.search(raw):
+            try:
+                return orjson.dumps(orjson.loads(raw), option=orjson.OPT_INDENT_2).decode("utf-8")
+            except (orjson.JSONDecodeError, orjson.JSONEncodeError):
+                pass
+        content = json.loads(raw.decode("utf-8"))
+        return json.dumps(content, indent=2, ensure_ascii=False)
+
 # Deriv class: xls, xlsx excel spreadsheets
 class Deriv_ExcelFileReader(Base_FileVisitor):
     """
@@ -183,6 +255,11 @@ class Deriv_ExcelFileReader(Base_FileVisitor):
     
     def read(self, as_markdown: bool = False) -> str:
         try:
+            if self.extension.lower() == '.xlsx':
+                return self._read_xlsx(as_markdown)
+            
+            # Legacy .xls goes through pandas
+            import pandas as pd
             dfs = pd.read_excel(self.file_path, sheet_name=None)
             output = []
             for sheet_name, df in dfs.items():
@@ -197,6 +274,28 @@ class Deriv_ExcelFileReader(Base_FileVisitor):
         except Exception as e:
             raise FileReadError(f"Failed to read the excel spreadsheet: {str(e)}")
 
+    def _read_xlsx(self, as_markdown: bool) -> str:
+        """
+        Stream .xlsx sheets row by row in openpyxl read-only mode, without building DataFrames
+        The first row of each sheet is taken as its header
+        """
+        from openpyxl import load_workbook # pip install openpyxl
+        wb = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            output = []
+            for ws in wb.worksheets:
+                rows = (["" if v is None else str(v) for v in row]
+                        for row in ws.iter_rows(values_only=True))
+                if as_markdown:
+                    output.append(f"# {ws.title}")
+                    output.append(self._to_markdown_table(rows))
+                else:
+                    output.append(f"Sheet: {ws.title}")
+                    output.append("\n".join(map(" | ".join, rows)))
+            return "\n\n".join(output)
+        finally:
+            wb.close()
+
 # Deriv class: docx world document
 class Deriv_WordFileReader(Base_FileVisitor):
     """
@@ -215,6 +314,7 @@ class Deriv_WordFileReader(Base_FileVisitor):
         Process .docx files
         """
         try:
+            from docx import Document # pip install python-docx
             doc = Document(self.file_path)
             content = []
             
@@ -250,27 +350,46 @@ class Deriv_WordFileReader(Base_FileVisitor):
         Get styled text
         """
         # Process headings
-        if para.style.name.startswith('Heading'):
-            level = int(para.style.name.split()[-1])
+        style_name = para.style.name
+        if style_name.startswith('Heading'):
+            level = int(style_name.split()[-1])
             return f"{'#' * level} {para.text.strip()}"
         
-        # Process text styles (markdown)
-        text_parts = []
-        for run in para.runs:
-            text = run.text
+        # Collect (text, bold, italic, underline) from the <w:r> children in one pass
+        # over their xml, instead of going through a Run and Font proxy per attribute
+        runs = []
+        for r in para._p.iterchildren(_W_R):
+            text = r.text
             if not text.strip():
                 continue
-            
+            bold = italic = underline = False
             if as_markdown:
-                if run.bold:
-                    text = f"**{text}**"
-                if run.italic:
-                    text = f"*{text}*"
-                if run.underline:
-                    text = f"__{text}__"
-            text_parts.append(text)
+                rPr = r.find(_W_RPR)
+                if rPr is not None:
+                    for prop in rPr:
+                        if prop.tag == _W_B:
+                            bold = prop.get(_W_VAL) not in _W_OFF
+                        elif prop.tag == _W_I:
+                            italic = prop.get(_W_VAL) not in _W_OFF
+                        elif prop.tag == _W_U:
+                            underline = prop.get(_W_VAL, 'none') != 'none'
+            runs.append((text, bold, italic, underline))
         
-        return ''.join(text_parts)
+        # Process text styles (markdown)
+        return ''.join(self._style_run(*run) for run in runs)
+
+    @staticmethod
+    def _style_run(text: str, bold: bool, italic: bool, underline: bool) -> str:
+        """
+        Wrap a run in its markdown emphasis
+        """
+        if bold:
+            text = f"**{text}**"
+        if italic:
+            text = f"*{text}*"
+        if underline:
+            text = f"__{text}__"
+        return text
 
     def _process_table(self, table, as_markdown: bool) -> str:
         """
@@ -318,13 +437,18 @@ class Deriv_PdfFileReader(Base_FileVisitor):
     
     def read(self, as_markdown: bool = False) -> str:
         try:
-            text = []
-            with pdfplumber.open(self.file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text.append(page_text.strip())
-            content = "\n\n".join(text)
+            # PyMuPDF extracts the plain text stream without building a layout model
+            if pymupdf is not None:
+                with pymupdf.open(self.file_path) as pdf:
+                    content = "\n\n".join(
+                        t.strip() for t in (page.get_text("text") for page in pdf) if t
+                    )
+            else:
+                import pdfplumber # pip install pdfplumber
+                with pdfplumber.open(self.file_path) as pdf:
+                    content = "\n\n".join(
+                        t.strip() for t in (page.extract_text() for page in pdf.pages) if t
+                    )
         except Exception as e:
             raise FileReadError(f"Failed to read a pdf document: {str(e)}")
 
@@ -336,27 +460,26 @@ class Generic_FileVisitor:
     Generic File reader factory class
     """
     
-    @staticmethod
-    def create_reader(file_path: str) -> Base_FileVisitor:
+    # Reader class by lower-case file extension
+    _READERS = {
+        ".txt": Deriv_TextFileReader,
+        ".csv": Deriv_CsvFileReader,
+        ".json": Deriv_JsonFileReader,
+        ".xls": Deriv_ExcelFileReader,
+        ".xlsx": Deriv_ExcelFileReader,
+        ".docx": Deriv_WordFileReader,
+        ".pdf": Deriv_PdfFileReader,
+    }
+    
+    @classmethod
+    def create_reader(cls, file_path: str) -> Base_FileVisitor:
         """
         Create a corresponding reader instance based on the file extension
         """
         ext = os.path.splitext(file_path)[1].lower()
-        readers = {
-            ".txt": Deriv_TextFileReader,
-            ".csv": Deriv_CsvFileReader,
-            ".json": Deriv_JsonFileReader,
-            ".xls": Deriv_ExcelFileReader,
-            ".xlsx": Deriv_ExcelFileReader,
-            ".docx": Deriv_WordFileReader,
-            ".pdf": Deriv_PdfFileReader,
-        }
-        
-        if ext not in readers:
-            # Regard as txt
-            return readers[".txt"](file_path)
         
-        return readers[ext](file_path)
+        # Unknown extensions are regarded as txt
+        return cls._READERS.get(ext, Deriv_TextFileReader)(file_path)
 
 # API: File visitor (noexcept)
 def file_visitor(file_path: str, as_markdown: bool = False, noexcept: bool = True) -> str:
@@ -379,8 +502,6 @@ def is_file(anything: str) -> int:
     Return 0(nonexist file), 1(existing file), 2(url), 3(existing folder), -1(others)
     """
     s = anything.strip()
-    parsed = urlparse(s)
-    scheme = parsed.scheme.lower()
     
     # Constant defines
     _nfile   =  0
@@ -389,28 +510,25 @@ def is_file(anything: str) -> int:
     _folder  =  3
     _other   = -1
 
-    if scheme:
-        if scheme == 'file':
-            # For file URLs, convert the URL path to a local file path.
-            path = unquote(parsed.path)
-            if os.name == 'nt':
-                # On Windows, remove a leading slash if it precedes a drive letter.
-                if path.startswith('/') and len(path) > 1 and path[2] == ':':
-                    path = path.lstrip('/')
-            if os.path.exists(path):
-                return _folder if os.path.isdir(path) else _file
-            else:
-                return _nfile
-        elif scheme in ('http', 'https', 'ftp', 'udp'):
-            return _url
+    # A scheme can only be the text before the first ':', so plain paths
+    # (including Windows drive letters) are settled without urlparse
+    scheme = s.partition(':')[0].lower() if ':' in s else ''
+    
+    if scheme in _URL_SCHEMES:
+        return _url
+    elif scheme == 'file':
+        # For file URLs, convert the URL path to a local file path.
+        path = unquote(urlparse(s).path)
+        if _IS_NT:
+            # On Windows, remove a leading slash if it precedes a drive letter.
+            if path.startswith('/') and len(path) > 1 and path[2] == ':':
+                path = path.lstrip('/')
+        if os.path.exists(path):
+            return _folder if os.path.isdir(path) else _file
         else:
-            # Unknown scheme; treat as local path.
-            if os.path.exists(s):
-                return _folder if os.path.isdir(s) else _file
-            else:
-                return _other
+            return _nfile
     else:
-        # No scheme provided; assume it's a local file path.
+        # No scheme or an unknown one; treat as local path.
         if os.path.exists(s):
             return _folder if os.path.isdir(s) else _file
         else:
@@ -8,15 +8,16 @@
 
 import os
 import re
+import queue
 import email
+import email.policy
+import email.utils
+from email.message import EmailMessage
+import functools
 import base64
-import pdfkit # pip install pdfkit
 import datetime
 import subprocess
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from debug import nathui_chorme_path
@@ -24,6 +25,14 @@ from debug import nathui_chorme_path
 # Default chorme path
 default_chorme_path = nathui_chorme_path
 
+# Characters that cannot be part of a file path name
+_INVALID_PATH_CHARS = '<>:"/\\|?*'
+
+# str.translate table replacing every invalid path character
+@functools.lru_cache(maxsize=16)
+def _path_translation(replacement: str) -> dict:
+    return str.maketrans({c: replacement for c in _INVALID_PATH_CHARS})
+
 # Replace invalid path-characters in a string
 def sanitize_path_name(name: str, replacement: str = "_") -> str:
     """
@@ -33,17 +42,47 @@ def sanitize_path_name(name: str, replacement: str = "_") -> str:
     :param replacement: The character to replace invalid characters with.
     :return: A sanitized string.
     """
-    # Define a regex pattern to match invalid characters for file paths
-    invalid_chars_pattern = r'[<>:"/\\|?*]'
-    
     # Replace invalid characters with the specified replacement character
-    sanitized_name = re.sub(invalid_chars_pattern, replacement, name)
+    sanitized_name = name.translate(_path_translation(replacement))
     
     # Ensure the sanitized name doesn't have trailing or leading spaces
     sanitized_name = sanitized_name.strip()
     
     return sanitized_name
 
+# Chrome Page.printToPDF options
+def make_print_options(
+    pagesize: tuple = (11, 8.5),
+    landscape: bool = True,
+    printBackground: bool = True,
+    displayHeaderFooter: bool = False,
+    marginTop: float = 0.4,
+    marginBottom: float = 0.4,
+    marginLeft: float = 0.4,
+    marginRight: float = 0.4,
+    scale: float = 0.9,
+    pageRanges: str = "",
+    headerTemplate: str = "",
+    footerTemplate: str = "",
+    preferCSSPageSize: bool = False
+) -> dict:
+    return {
+        "landscape": landscape,                   # Horizontal layout.
+        "printBackground": printBackground,       # Print background graphics.
+        "paperWidth": pagesize[0],                # Paper width in inches.
+        "paperHeight": pagesize[1],               # Paper height in inches.
+        "displayHeaderFooter": displayHeaderFooter,  # Include header/footer.
+        "marginTop": marginTop,                   # Top margin.
+        "marginBottom": marginBottom,             # Bottom margin.
+        "marginLeft": marginLeft,                 # Left margin.
+        "marginRight": marginRight,               # Right margin.
+        "scale": scale,                           # Scaling factor.
+        "pageRanges": pageRanges,                 # Specific pages to print.
+        "headerTemplate": headerTemplate,         # HTML template for header.
+        "footerTemplate": footerTemplate,         # HTML template for footer.
+        "preferCSSPageSize": preferCSSPageSize    # Prefer CSS-defined page size if available.
+    }
+
 # Convert hmtml to pdf
 def convert_mhtml_to_pdf(
     mhtml_file: str, 
@@ -64,6 +103,11 @@ def convert_mhtml_to_pdf(
     footerTemplate: str = "",
     preferCSSPageSize: bool = False
 ):
+    # Selenium is only loaded once a browser is actually needed
+    from selenium import webdriver # pip install selenium
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    
     # Resolve absolute paths for the MHTML file and output PDF.
     mhtml_path = os.path.abspath(mhtml_file)
     pdf_path = os.path.abspath(pdf_file)
@@ -85,22 +129,11 @@ def convert_mhtml_to_pdf(
         driver.get(file_uri)
         
         # Set up the print options for PDF generation.
-        print_options = {
-            "landscape": landscape,                   # Horizontal layout.
-            "printBackground": printBackground,       # Print background graphics.
-            "paperWidth": pagesize[0],                # Paper width in inches.
-            "paperHeight": pagesize[1],               # Paper height in inches.
-            "displayHeaderFooter": displayHeaderFooter,  # Include header/footer.
-            "marginTop": marginTop,                   # Top margin.
-            "marginBottom": marginBottom,             # Bottom margin.
-            "marginLeft": marginLeft,                 # Left margin.
-            "marginRight": marginRight,               # Right margin.
-            "scale": scale,                           # Scaling factor.
-            "pageRanges": pageRanges,                 # Specific pages to print.
-            "headerTemplate": headerTemplate,         # HTML template for header.
-            "footerTemplate": footerTemplate,         # HTML template for footer.
-            "preferCSSPageSize": preferCSSPageSize    # Prefer CSS-defined page size if available.
-        }
+        print_options = make_print_options(
+            pagesize, landscape, printBackground, displayHeaderFooter,
+            marginTop, marginBottom, marginLeft, marginRight, scale,
+            pageRanges, headerTemplate, footerTemplate, preferCSSPageSize
+        )
         
         # Execute the command to render the page as PDF.
         result = driver.execute_cdp_cmd("Page.printToPDF", print_options)
@@ -112,18 +145,71 @@ def convert_mhtml_to_pdf(
     finally:
         driver.quit()
 
+# Static page detection: script tags and markers of client-side rendered (SPA) shells
+_SCRIPT_TAG_RE = re.compile(rb'<script\b', re.IGNORECASE)
+_SPA_MARKER_RE = re.compile(
+    rb'__NEXT_DATA__|__NUXT__|ng-app|data-reactroot|data-server-rendered'
+    rb'|id=["\'](?:root|app)["\']\s*>\s*</div>|enable javascript',
+    re.IGNORECASE
+)
+_STATIC_MAX_SCRIPTS = 8     # More script tags than this and Chrome renders the page
+_STATIC_MIN_BYTES = 2048    # Smaller documents are usually bootstrap shells
+_STATIC_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                      "AppleWebKit/537.36 (KHTML, like Gecko) "
+                      "Chrome/92.0.4515.159 Safari/537.36")
+
+# See whether a fetched html document is already fully rendered
+def _looks_static(html: bytes) -> bool:
+    if len(html) < _STATIC_MIN_BYTES:
+        return False
+    if len(_SCRIPT_TAG_RE.findall(html)) > _STATIC_MAX_SCRIPTS:
+        return False
+    return _SPA_MARKER_RE.search(html) is None
+
+# Wrap an html document into a single-part MHTML (multipart/related) archive
+def _html_to_mhtml(html: str, url: str) -> bytes:
+    msg = EmailMessage()
+    msg["From"] = "<Saved by NathUI>"
+    msg["Snapshot-Content-Location"] = url
+    msg["Date"] = email.utils.formatdate(localtime=True)
+    msg.set_content(html, subtype="html", charset="utf-8", cte="quoted-printable")
+    msg.make_related()
+    msg.set_param("type", "text/html")
+    msg.get_payload()[0]["Content-Location"] = url
+    return msg.as_bytes(policy=email.policy.SMTP)
+
+# Chrome arguments for Website_Mhtml drivers
+_CHROME_HEADLESS_ARGS = ("--headless", "--disable-gpu")
+_CHROME_ARGS = ("--no-sandbox", "--disable-dev-shm-usage", "--disable-extensions", "--save-page-as-mhtml")
+
+# Chrome options shared by all Website_Mhtml drivers with the same settings
+@functools.lru_cache(maxsize=4)
+def _chrome_options(headless: bool, load_images: bool):
+    from selenium.webdriver.chrome.options import Options # pip install selenium
+    
+    chrome_options = Options()
+    for arg in (_CHROME_HEADLESS_ARGS + _CHROME_ARGS if headless else _CHROME_ARGS):
+        chrome_options.add_argument(arg)
+    if not load_images:
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return chrome_options
+
 # Web Mhtml (specially adjusted versin)
 class Website_Mhtml:
-    def __init__(self, driver_path: str, headless: bool = True, init_time: int = 5, wait_time: int = 5):
+    def __init__(self, driver_path: str, headless: bool = True, init_time: int = 5, wait_time: int = 5, load_images: bool = True, static_fast_path: bool = True):
         """
         Initialize the WebsiteDumper class with options for Chrome WebDriver.
 
         :param driver_path: Path to the Chrome WebDriver executable.
         :param headless: Boolean to determine if the browser should run in headless mode.
         :param wait_time: Time to wait for resources to load (in seconds).
+        :param load_images: Set to False to skip image downloads when only the page structure is needed.
+        :param static_fast_path: Save pages that need no scripts from a plain http request, without Chrome.
         """
         self.driver_path = driver_path
         self.headless = headless
+        self.load_images = load_images
+        self.static_fast_path = static_fast_path
         self.init_time = init_time
         self.wait_time = wait_time
         self.driver = None
@@ -133,35 +219,66 @@ class Website_Mhtml:
         """
         Set up the Selenium WebDriver with Chrome options.
         """
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--save-page-as-mhtml")
+        from selenium import webdriver # pip install selenium
+        from selenium.webdriver.chrome.service import Service
+        
+        # A Service owns one chromedriver process, so each driver still gets its own
+        service = Service(self.driver_path, service_args=["--log-level=OFF"])
+        self.driver = webdriver.Chrome(service=service, options=_chrome_options(self.headless, self.load_images))
+
+    # Page state probe: number of resources fetched so far, or -1 while the document or jQuery is still busy
+    _BUSY_PROBE = (
+        "if (document.readyState !== 'complete') return -1;"
+        "if (window.jQuery && window.jQuery.active) return -1;"
+        "return performance.getEntriesByType('resource').length;"
+    )
+
+    # Stepped scroll, one step per animation frame so lazy loaders see every position
+    _SCROLL_SCRIPT = (
+        "var step = arguments[0], times = arguments[1], done = arguments[arguments.length - 1];"
+        "function next() {"
+        "  if (times-- <= 0) { done(); return; }"
+        "  var y = window.scrollY;"
+        "  window.scrollBy(0, step);"
+        "  if (window.scrollY === y) { done(); return; }"
+        "  requestAnimationFrame(next);"
+        "}"
+        "next();"
+    )
+
+    def _wait_until_idle(self, timeout: float, quiet_time: float = 0.5):
+        """
+        Waits until the page has loaded and no further resource finished loading for quiet_time seconds.
+        Gives up silently after timeout seconds, the snapshot is then taken as it is.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
         
-        service = Service(self.driver_path)
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        state = {"count": None, "since": time.monotonic()}
+        
+        def idle(driver):
+            count = driver.execute_script(self._BUSY_PROBE)
+            now = time.monotonic()
+            if count < 0 or count != state["count"]:
+                state["count"], state["since"] = count, now
+                return False
+            return now - state["since"] >= quiet_time
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(idle)
+        except TimeoutException:
+            pass
 
     def _scroll_to_load_resources(self):
         """
         Scrolls through the webpage step by step to ensure all lazy-loaded resources are loaded.
         """
         scroll_times = 10
-        scroll_pause_time = 0.20  # Pause between scrolls (seconds)
         scroll_step = 500  # Number of pixels to scroll by each step
         
-        # Scorll down for some times
-        for tm in range(scroll_times):
-            # Scroll down by a specific step
-            self.driver.execute_script(f"window.scrollBy(0, {scroll_step});")
-            time.sleep(scroll_pause_time)  # Pause to allow resources to load
-        
-        # Scroll up for a specified number of times
-        for tm in range(scroll_times):
-            # Scroll up by a specific step (negative value for upward scrolling)
-            self.driver.execute_script(f"window.scrollBy(0, {-scroll_step});")
-            time.sleep(scroll_pause_time)  # Pause to allow resources to adjust
+        # Scroll down, then back up to the top
+        self.driver.execute_async_script(self._SCROLL_SCRIPT, scroll_step, scroll_times)
+        self.driver.execute_async_script(self._SCROLL_SCRIPT, -scroll_step, scroll_times)
  
     def dump_website(self, url: str, output_path: str, retries: int = 5):
         """
@@ -177,6 +294,60 @@ class Website_Mhtml:
         if not os.access(os.path.dirname(output_path), os.W_OK):
             raise ValueError("Output path is not writable.")
         
+        # Pages that render without scripts are saved straight from the http response
+        if self.static_fast_path and self._dump_static(url, output_path):
+            print(f"Website successfully dumped to: {output_path}")
+            return
+        
+        self._dump(url, output_path, retries)
+
+    def _dump_static(self, url: str, output_path: str, timeout: int = 10) -> bool:
+        """
+        Fetches the website with requests and saves it as MHTML if it looks fully rendered.
+        Returns False, leaving the page to Chrome, for script-rendered pages or failed requests.
+        """
+        import requests # pip install requests
+        try:
+            response = requests.get(url, headers={"User-Agent": _STATIC_USER_AGENT}, timeout=timeout)
+            response.raise_for_status()
+        except requests.RequestException:
+            return False
+        
+        content_type = response.headers.get("Content-Type", "").lower()
+        if "text/html" not in content_type or not _looks_static(response.content):
+            return False
+        
+        # Without a declared charset requests would assume ISO-8859-1
+        if "charset" not in content_type:
+            response.encoding = response.apparent_encoding
+        with open(output_path, "wb") as file:
+            file.write(_html_to_mhtml(response.text, response.url))
+        return True
+
+    def dump_and_print_pdf(self, url: str, mhtml_out: str, pdf_out: str, print_options: dict, retries: int = 5) -> bool:
+        """
+        Dumps the website at the specified URL into a PDF file, printed from the same session
+        that loaded the page, and optionally into an MHTML file as well.
+
+        :param url: The URL of the website to dump.
+        :param mhtml_out: The file path where the MHTML file will be saved, or None to skip it.
+        :param pdf_out: The file path where the PDF file will be saved.
+        :param print_options: Options for Chrome's Page.printToPDF, see make_print_options.
+        :param retries: Number of retry attempts for the capture.
+        :return: True if the PDF was written.
+        :raises ValueError: If the URL is invalid or output path is not writable.
+        """
+        if not url.startswith("http"):
+            raise ValueError("Invalid URL. Make sure it starts with 'http' or 'https'.")
+        if not os.access(os.path.dirname(os.path.abspath(pdf_out)), os.W_OK):
+            raise ValueError("Output path is not writable.")
+        
+        return self._dump(url, mhtml_out, retries, pdf_out, print_options)
+
+    def _dump(self, url: str, output_path: str, retries: int, pdf_path: str = None, print_options: dict = None) -> bool:
+        """
+        Loads the website and captures it as MHTML and/or PDF, retrying on failure.
+        """
         attempt = 0
         while attempt < retries:
             try:
@@ -184,41 +355,57 @@ class Website_Mhtml:
                     self._setup_driver()
                 self.driver.get(url)
                 
-                # Wait for resources
-                time.sleep(self.init_time)  # Initial wait for basic resources to load
+                # Wait for resources, at most init_time
+                self._wait_until_idle(self.init_time)
                 
                 # Scroll through the page to load all resources
                 self._scroll_to_load_resources()
                 
-                # Wait for resources
-                time.sleep(self.wait_time)  # Ending wait for basic resources to load
+                # Wait for the lazy-loaded resources, at most wait_time
+                self._wait_until_idle(self.wait_time)
                 
                 # Capture the webpage as an MHTML file
-                mhtml_data = self.driver.execute_cdp_cmd("Page.captureSnapshot", {"format": "mhtml"})["data"]
-                with open(output_path, "wb") as file:
-                    file.write(mhtml_data.encode("utf-8"))
-                print(f"Website successfully dumped to: {output_path}")
-                return  # Exit after successful dump
+                if output_path is not None:
+                    mhtml_data = self.driver.execute_cdp_cmd("Page.captureSnapshot", {"format": "mhtml"})["data"]
+                    with open(output_path, "wb") as file:
+                        file.write(mhtml_data.encode("utf-8"))
+                    print(f"Website successfully dumped to: {output_path}")
+                
+                # Print the already rendered page as a PDF file
+                if pdf_path is not None:
+                    pdf_data = self.driver.execute_cdp_cmd("Page.printToPDF", print_options)["data"]
+                    with open(pdf_path, "wb") as file:
+                        file.write(base64.b64decode(pdf_data))
+                    print(f"Website successfully printed to: {pdf_path}")
+                return True  # Exit after successful dump
             except Exception as e:
                 print(f"Attempt {attempt + 1} failed: {e}")
+                # Drop the session, it may have crashed; the next attempt starts a fresh Chrome
+                self.close()
                 attempt += 1
                 time.sleep(1)  # Small delay before retry
                 
         self.errored_sites.append(url)
         # print(f"Failed to dump {url} after {retries} attempts.")
+        return False
 
     def close(self):
         """
         Closes the WebDriver if it's running.
         """
         if self.driver:
-            self.driver.quit()
+            try:
+                self.driver.quit()
+            except Exception:
+                pass  # The session is already gone
             self.driver = None
 
     @staticmethod
-    def dump_websites_in_parallel(driver_path: str, urls_and_paths: list, headless: bool = True, init_time: int = 5, wait_time: int = 5, retries: int = 5, max_workers: int = 4):
+    def dump_websites_in_parallel(driver_path: str, urls_and_paths: list, headless: bool = True, init_time: int = 5, wait_time: int = 5, retries: int = 5, max_workers: int = 4, load_images: bool = True, static_fast_path: bool = True):
         """
         Dumps multiple websites into MHTML files in parallel.
+        Each worker thread checks out one long-lived dumper, so Chrome is started
+        at most once per worker rather than once per URL.
 
         :param driver_path: Path to the Chrome WebDriver executable.
         :param urls_and_paths: List of tuples (URL, output_path).
@@ -226,19 +413,32 @@ class Website_Mhtml:
         :param wait_time: Time to wait for resources to load (in seconds).
         :param retries: Number of retry attempts for each MHTML capture.
         :param max_workers: Maximum number of parallel threads.
+        :param load_images: Set to False to skip image downloads when only the page structure is needed.
+        :param static_fast_path: Save pages that need no scripts from a plain http request, without Chrome.
         """
+        # The driver itself is started lazily by the first dump_website call
+        dumpers = queue.Queue()
+        for _ in range(max_workers):
+            dumpers.put(Website_Mhtml(driver_path, headless=headless, init_time=init_time, wait_time=wait_time, load_images=load_images, static_fast_path=static_fast_path))
+
         def process_task(url, output_path):
-            dumper = Website_Mhtml(driver_path, headless=headless, init_time=init_time, wait_time=wait_time)
-            dumper.dump_website(url, output_path, retries=retries)
-            dumper.close()
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [executor.submit(process_task, url, output_path) for url, output_path in urls_and_paths]
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    print(f"Error during parallel execution: {e}")
+            dumper = dumpers.get()
+            try:
+                dumper.dump_website(url, output_path, retries=retries)
+            finally:
+                dumpers.put(dumper)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(process_task, url, output_path) for url, output_path in urls_and_paths]
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Error during parallel execution: {e}")
+        finally:
+            while not dumpers.empty():
+                dumpers.get().close()
 
 # Webdump Class
 class Website_Dump:
@@ -260,15 +460,12 @@ class Website_Dump:
         
         try:
         
-            # Save as mhtml
+            # Save as mhtml and print to pdf in one browser session
             # NathMath @ bilibili
-            self.backend.dump_website(url, output_file + ".mhtml")
+            printed = self.backend.dump_and_print_pdf(url, output_file + ".mhtml", output_file, make_print_options())
             self.backend.close()
             
-            # Convert to pdf
-            self.convert_mhtml_to_pdf(output_file + ".mhtml", output_file)
-            
-            return output_file
+            return output_file if printed else ""
             
         except:
             return ""